@@ -6,7 +6,7 @@ Loads brand visuals, creates optimized prompts, and generates images.
 
 Communication Protocol (LangGraph Standard):
 - Receives: Structured JSON task from Soshie via HumanMessage
-- Returns: Structured JSON result for Soshie to interpret
+- Returns: ImageTaskOutput in the agent's "structured_response"
 
 Input Format (JSON):
     {
@@ -18,7 +18,7 @@ Input Format (JSON):
         "user_id": "uuid"
     }
 
-Output Format (JSON):
+Output Format (ImageTaskOutput, via response_format):
     {
         "success": true,
         "status": "success",
@@ -32,7 +32,7 @@ Output Format (JSON):
     }
 
 Architecture:
-    Soshie → generate_image tool → Image Gen Agent → returns JSON → Soshie
+    Soshie → generate_image tool → Image Gen Agent → structured_response → Soshie
 
 Tools:
 - get_brand_visuals: Load brand colors/logo from knowledge base
@@ -50,6 +50,7 @@ from langgraph.checkpoint.base import BaseCheckpointSaver
 
 from app.agents.base import get_llm
 from app.tools.image_gen_tools import IMAGE_GEN_TOOLS
+from app.schemas.subagent import ImageTaskOutput
 
 logger = logging.getLogger(__name__)
 
@@ -108,8 +109,13 @@ Returns: status, image_url, prompt used, enhanced_prompt, dimensions.
 ## Your Process
 
 1. **Parse the input JSON** to understand the task
-2. **ALWAYS call get_brand_visuals first** - even if include_brand_colors is false
+2. **ALWAYS call get_brand_visuals** - even if include_brand_colors is false
+   (create_image needs the logo and uploaded images)
 3. **Call generate_image_prompt** to create an optimized prompt
+   - If include_brand_colors is true, call get_brand_visuals first, then pass
+     its result to generate_image_prompt as brand_visuals
+   - If include_brand_colors is false, the prompt does not need brand visuals:
+     call get_brand_visuals and generate_image_prompt together in the same turn
 4. **ALWAYS include reference images** when calling create_image:
    - **logo_url**: Include in EVERY image for brand consistency
    - **uploaded_images**: Scan for relevant product/team/asset images to include
@@ -155,37 +161,28 @@ If no uploaded_images exist, STILL include logo_url as reference.
 
 ## Output Format (CRITICAL)
 
-After generating the image, return the JSON result from create_image.
-Do NOT add markdown formatting, "Image Details" sections, or display the image.
-Your response should be ONLY the JSON result:
+After generating the image, finish by returning the structured ImageTaskOutput
+result. Fill its fields from create_image's result:
+- success, status, image_url, prompt_used, enhanced_prompt, negative_prompt
+- style, aspect_ratio, platform, dimensions, provider, model
+- brand_colors_used, message (a short human-readable status)
+- error and error_detail if generation failed
 
-```json
-{
-    "success": true,
-    "status": "success",
-    "image_url": "https://storage.example.com/image.png",
-    "prompt_used": "the optimized prompt used",
-    "enhanced_prompt": "LLM-enhanced version if any",
-    "style": "photo_realistic",
-    "aspect_ratio": "1:1",
-    "platform": "linkedin",
-    "dimensions": "1080x1080",
-    "message": "Image generated successfully using Nano Banana Pro.",
-    "provider": "openrouter",
-    "model": "gemini-3-pro-image-preview"
-}
-```
+Do NOT write the result out as JSON or prose in a chat message, and do not add
+markdown, "Image Details" sections, or image embeds. The structured result is
+the only output Soshie reads.
 
 ## Important Rules
 
-- **ALWAYS call get_brand_visuals first** - no exceptions
+- **ALWAYS call get_brand_visuals before create_image** - no exceptions (alongside
+  generate_image_prompt when include_brand_colors is false, before it otherwise)
 - **ALWAYS pass reference_image_urls to create_image** - include logo at minimum
 - **Scan uploaded_images for relevant assets** - products, team photos, etc.
 - If logo_url exists, it MUST be in reference_image_urls
 - If relevant product/team images exist in uploaded_images, include them
 - Include brand colors when creating professional/brand content
 - If image generation fails due to safety filters, return error with suggestion
-- Return ONLY JSON - no markdown, no image embeds, no explanations
+- Return the result ONLY as the structured ImageTaskOutput - no free-text answer
 """
 
 
@@ -201,7 +198,7 @@ def create_image_gen_agent(
     Create the Image Generation subagent.
     
     This is a tool-calling agent that receives structured JSON input
-    and returns structured JSON output.
+    and returns its result as an ImageTaskOutput in "structured_response".
     
     Args:
         model: Optional LLM instance. If not provided, uses configured provider.
@@ -219,6 +216,8 @@ def create_image_gen_agent(
         tools=IMAGE_GEN_TOOLS,
         name="image_gen",
         system_prompt=IMAGE_GEN_SYSTEM_PROMPT,
+        # Final result comes back typed in "structured_response"
+        response_format=ImageTaskOutput,
         checkpointer=checkpointer,
     )
     
@@ -235,11 +234,23 @@ def create_image_gen_agent(
 # CONVENIENCE EXPORT
 # =============================================================================
 
+# Shared checkpointer-less instance; the compiled graph holds no per-run state
+_image_gen_agent = None
+
+
 def get_image_gen_agent(checkpointer: Optional[BaseCheckpointSaver] = None):
     """
     Get or create the Image Generation subagent.
     
     Note: Subagents typically don't need a checkpointer
-    since they're invoked fresh for each request.
+    since they're invoked fresh for each request. Without one, the
+    agent is built once and reused across calls.
     """
-    return create_image_gen_agent(checkpointer=checkpointer)
+    global _image_gen_agent
+    
+    if checkpointer is not None:
+        return create_image_gen_agent(checkpointer=checkpointer)
+    
+    if _image_gen_agent is None:
+        _image_gen_agent = create_image_gen_agent()
+    return _image_gen_agent
@@ -46,6 +46,10 @@ class Settings(BaseSettings):
     # Composio (for integrations)
     composio_api_key: str = ""
     
+    # Outbound HTTP (shared client for page fetches by tools and services)
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    
     @property
     def cors_origins_list(self) -> List[str]:
         """Parse CORS origins from comma-separated string."""
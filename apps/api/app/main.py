@@ -18,6 +18,7 @@ from app.config import get_settings
 from app.routers import health, integrations, gallery, tasks, knowledge
 from app.routers.langgraph_api import setup_langgraph_routes
 from app.core.database import init_checkpointer, close_checkpointer
+from app.services.brand_extractor import close_http_client
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -48,6 +49,7 @@ async def lifespan(app: FastAPI):
     yield
     
     # Shutdown
+    await close_http_client()
     await close_checkpointer()
     logger.info("Dooza AI API shutdown complete")
 
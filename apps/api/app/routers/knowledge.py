@@ -23,6 +23,7 @@ from app.services.knowledge_service import (
     BrandAsset,
     BrandContext,
 )
+from app.tools.seo_tools import invalidate_user_website_cache
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -236,6 +237,9 @@ async def update_brand_settings(
             detail="Failed to save brand settings",
         )
     
+    # The website may have changed; SEO tools must not audit the old one
+    invalidate_user_website_cache()
+    
     logger.info(f"Updated brand settings for org {org_id}")
     return settings_to_response(settings)
 
@@ -34,6 +34,7 @@ from app.schemas.content_workflow import (
     ContentBrief,
     DraftContent,
     ContentFeedback,
+    DraftWithFeedback,
     FinalContent,
     WorkflowMetadata,
 )
@@ -65,6 +66,7 @@ __all__ = [
     "ContentBrief",
     "DraftContent",
     "ContentFeedback",
+    "DraftWithFeedback",
     "FinalContent",
     "WorkflowMetadata",
 ]
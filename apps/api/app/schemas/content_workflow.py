@@ -174,6 +174,17 @@ class ContentFeedback(BaseModel):
         return self.overall_score >= 7.0 and self.grade == "pass"
 
 
+class DraftWithFeedback(BaseModel):
+    """
+    First draft together with its evaluation.
+    
+    Lets the workflow write and grade the initial draft in one LLM call;
+    refinements are still graded separately with ContentFeedback.
+    """
+    text: str = Field(description="The post content only, no commentary")
+    evaluation: ContentFeedback = Field(description="Critical evaluation of the post")
+
+
 # =============================================================================
 # FINAL OUTPUT SCHEMA
 # =============================================================================
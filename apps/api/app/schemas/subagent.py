@@ -19,10 +19,14 @@ Benefits:
 
 from __future__ import annotations
 
+import json
+import logging
 from enum import Enum
 from typing import Optional
 from pydantic import BaseModel, Field
 
+logger = logging.getLogger(__name__)
+
 
 # =============================================================================
 # TASK TYPES
@@ -209,6 +213,30 @@ def build_image_message(task: ImageTaskInput) -> str:
 # RESULT PARSERS
 # =============================================================================
 
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _extract_json_object(content: str) -> Optional[dict]:
+    """
+    Decode the first JSON object embedded in free text.
+    
+    Decodes in place from the first '{' with JSONDecoder.raw_decode, which
+    stops at the end of that object, so any trailing text is ignored.
+    
+    Returns:
+        The decoded object, or None if the text contains no '{'
+    
+    Raises:
+        json.JSONDecodeError: If the text at the first '{' is not valid JSON
+    """
+    start = content.find("{")
+    if start == -1:
+        return None
+    
+    data, _ = _JSON_DECODER.raw_decode(content, start)
+    return data
+
+
 def parse_research_result(content: str) -> ResearchTaskOutput:
     """
     Parse subagent response into structured output.
@@ -218,14 +246,10 @@ def parse_research_result(content: str) -> ResearchTaskOutput:
     - Enum values (converts to strings)
     - Fallback to raw content if parsing fails
     """
-    import json
-    import re
-    
     try:
         # Look for JSON in the response
-        json_match = re.search(r'\{[\s\S]*\}', content)
-        if json_match:
-            data = json.loads(json_match.group())
+        data = _extract_json_object(content)
+        if data is not None:
             
             # Convert enum values to strings if needed
             if "brand_voice" in data and hasattr(data["brand_voice"], "value"):
@@ -248,8 +272,7 @@ def parse_research_result(content: str) -> ResearchTaskOutput:
             return ResearchTaskOutput(**data)
     except (json.JSONDecodeError, Exception) as e:
         # Log for debugging but don't fail
-        import logging
-        logging.getLogger(__name__).debug(f"Failed to parse research result JSON: {e}")
+        logger.debug(f"Failed to parse research result JSON: {e}")
     
     # Fallback: wrap raw content as reasoning
     return ResearchTaskOutput(
@@ -277,14 +300,10 @@ def parse_image_result(content: str, fallback_description: str = "") -> ImageTas
     - Enum values (converts to strings)
     - Fallback to raw content if parsing fails
     """
-    import json
-    import re
-    
     try:
         # Look for JSON in the response
-        json_match = re.search(r'\{[\s\S]*\}', content)
-        if json_match:
-            data = json.loads(json_match.group())
+        data = _extract_json_object(content)
+        if data is not None:
             
             # Convert enum values to strings if needed
             if "status" in data and hasattr(data["status"], "value"):
@@ -311,8 +330,7 @@ def parse_image_result(content: str, fallback_description: str = "") -> ImageTas
             return ImageTaskOutput(**data)
     except (json.JSONDecodeError, Exception) as e:
         # Log for debugging but don't fail
-        import logging
-        logging.getLogger(__name__).debug(f"Failed to parse image result JSON: {e}")
+        logger.debug(f"Failed to parse image result JSON: {e}")
     
     # Fallback
     return ImageTaskOutput(
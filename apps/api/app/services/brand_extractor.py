@@ -20,10 +20,11 @@ from typing import Any, Optional, Tuple
 from urllib.parse import urljoin, urlparse
 
 import httpx
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer, Tag
 from pydantic import BaseModel, Field as PydanticField
 
 from app.agents.base import get_llm
+from app.config import get_settings
 from app.core.database import get_supabase_client
 from app.services.knowledge_service import get_knowledge_service
 
@@ -38,61 +39,181 @@ DEFAULT_TIMEOUT = 30.0
 MAX_RESPONSE_SIZE = 10 * 1024 * 1024  # 10MB
 USER_AGENT = 'Mozilla/5.0 (compatible; DoozaBot/1.0; +https://dooza.ai)'
 
+# BeautifulSoup tree builder: lxml's C parser, or the stdlib parser if lxml
+# is missing (slower, but lets brand extraction and SEO tools keep working)
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    logger.warning("lxml not installed, falling back to html.parser")
+    HTML_PARSER = 'html.parser'
+
+# Elements whose text is not part of the page's readable content
+NON_CONTENT_TAGS = frozenset({'script', 'style', 'noscript', 'header', 'footer', 'nav'})
+
+
+class ResponseTooLarge(ValueError):
+    """A response body exceeded the size limit it was read with."""
+
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared HTTP client for outbound page fetches.
+    
+    One pooled client is reused so repeated fetches to the same site keep
+    their connections alive instead of paying a new TCP/TLS handshake per
+    request. Pool size comes from settings.
+    """
+    global _http_client
+    
+    if _http_client is None or _http_client.is_closed:
+        settings = get_settings()
+        _http_client = httpx.AsyncClient(
+            follow_redirects=True,
+            timeout=DEFAULT_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=settings.http_max_connections,
+                max_keepalive_connections=settings.http_max_keepalive_connections,
+            ),
+        )
+    
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client (called on application shutdown)."""
+    global _http_client
+    
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+def normalize_url(url: str) -> str:
+    """Add an https:// scheme to a user-supplied URL that has none."""
+    if url.startswith(('http://', 'https://')):
+        return url
+    return 'https://' + url
+
 
 async def fetch_url(url: str, timeout: float = DEFAULT_TIMEOUT) -> Tuple[str, int]:
     """
     Fetch URL content with proper error handling.
     
     Args:
-        url: The URL to fetch
+        url: The URL to fetch (with scheme, see normalize_url)
         timeout: Request timeout in seconds
         
     Returns:
         Tuple of (html_content, status_code)
     """
-    # Normalize URL
-    if not url.startswith(('http://', 'https://')):
-        url = 'https://' + url
+    html, status_code, _ = await fetch_page(url, timeout)
+    return html, status_code
+
+
+async def fetch_page(url: str, timeout: float = DEFAULT_TIMEOUT) -> Tuple[str, int, str]:
+    """
+    Fetch URL content along with the response's Content-Type.
+    
+    Lets callers skip parsing bodies that are not HTML (PDFs, images).
     
+    Args:
+        url: The URL to fetch (with scheme, see normalize_url)
+        timeout: Request timeout in seconds
+        
+    Returns:
+        Tuple of (content, status_code, content_type); content_type is
+        empty if the server sent none
+    """
     headers = {
         'User-Agent': USER_AGENT,
         'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
         'Accept-Language': 'en-US,en;q=0.5',
     }
     
-    async with httpx.AsyncClient(
-        follow_redirects=True, 
-        timeout=timeout,
-        limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
-    ) as client:
-        response = await client.get(url, headers=headers)
+    client = get_http_client()
+    async with client.stream('GET', url, headers=headers, timeout=timeout) as response:
+        content = await read_text_limited(response)
+        return content, response.status_code, response.headers.get('content-type', '')
+
+
+async def read_text_limited(
+    response: httpx.Response,
+    max_size: int = MAX_RESPONSE_SIZE,
+) -> str:
+    """
+    Read a streamed response body as text, enforcing a size limit.
+    
+    Oversized bodies are rejected from Content-Length when present, and
+    otherwise as soon as the running byte count passes the limit, so a
+    server that omits the header cannot make us buffer an unbounded body.
+    
+    Args:
+        response: A response opened with client.stream()
+        max_size: Maximum body size in bytes
         
-        # Check response size
-        content_length = response.headers.get('content-length')
-        if content_length and int(content_length) > MAX_RESPONSE_SIZE:
-            raise ValueError(f"Response too large: {content_length} bytes")
+    Returns:
+        The decoded body
         
-        return response.text, response.status_code
+    Raises:
+        ResponseTooLarge: If the body is larger than max_size
+    """
+    content_length = response.headers.get('content-length')
+    if content_length and int(content_length) > max_size:
+        raise ResponseTooLarge(f"Response too large: {content_length} bytes")
+    
+    chunks = []
+    total = 0
+    async for chunk in response.aiter_bytes(64 * 1024):
+        total += len(chunk)
+        if total > max_size:
+            raise ResponseTooLarge(f"Response too large: more than {max_size} bytes")
+        chunks.append(chunk)
+    
+    return b''.join(chunks).decode(response.encoding or 'utf-8', errors='replace')
 
 
-def parse_html(html: str) -> BeautifulSoup:
-    """Parse HTML content with BeautifulSoup."""
-    return BeautifulSoup(html, 'html.parser')
+def parse_html(html: str, parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    """
+    Parse HTML content with BeautifulSoup (see HTML_PARSER).
+    
+    Args:
+        html: The HTML to parse
+        parse_only: Optional strainer; only matching elements are built
+            into the tree, which is much cheaper when a caller needs a
+            few tags from a large page
+    """
+    return BeautifulSoup(html, HTML_PARSER, parse_only=parse_only)
 
 
 def extract_text_content(soup: BeautifulSoup) -> str:
-    """Extract clean text content from parsed HTML."""
-    # Remove script and style elements
-    for element in soup(['script', 'style', 'noscript', 'header', 'footer', 'nav']):
-        element.decompose()
-    
-    # Get text
-    text = soup.get_text(separator=' ', strip=True)
+    """
+    Extract clean text content from parsed HTML.
     
-    # Clean up whitespace
-    text = re.sub(r'\s+', ' ', text)
+    Skips scripts, styles and page chrome (header, footer, nav) without
+    modifying the soup, so the same tree can be reused by other analyzers.
+    """
+    text_types = soup.interesting_string_types
+    parts = []
+    
+    # Iterative walk so skipped elements are pruned with their whole subtree
+    stack = [iter(soup.contents)]
+    while stack:
+        for node in stack[-1]:
+            if isinstance(node, Tag):
+                if node.name not in NON_CONTENT_TAGS:
+                    stack.append(iter(node.contents))
+                    break
+            elif type(node) in text_types:
+                # Splitting per string collapses whitespace as we go
+                parts.extend(node.split())
+        else:
+            stack.pop()
     
-    return text
+    return ' '.join(parts)
 
 
 async def download_and_upload_logo(
@@ -602,9 +723,7 @@ async def extract_and_save_brand(url: str, org_id: str, user_id: Optional[str] =
     """
     logger.info(f"Extracting brand from URL: {url} for org: {org_id}")
     
-    # Normalize URL
-    if not url.startswith(("http://", "https://")):
-        url = "https://" + url
+    url = normalize_url(url)
     
     # Fetch HTML
     try:
@@ -675,6 +794,13 @@ async def extract_and_save_brand(url: str, org_id: str, user_id: Optional[str] =
         created_by=user_id,
     )
     
+    if settings:
+        # Imported here: seo_tools imports this module
+        from app.tools.seo_tools import invalidate_user_website_cache
+        
+        # The website may have changed; SEO tools must not audit the old one
+        invalidate_user_website_cache()
+    
     # Save logo as brand asset (if found and not just favicon.ico)
     # Download from external URL and upload to Supabase Storage
     logo_saved = False
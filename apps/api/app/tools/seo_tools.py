@@ -17,21 +17,32 @@ Usage:
 
 from __future__ import annotations
 
+import asyncio
+import copy
+import heapq
 import json
 import logging
 import re
-from typing import Tuple
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from operator import itemgetter
+from typing import Dict, Optional, Tuple
 from urllib.parse import urljoin, urlparse
 
-import httpx
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer, Tag
 from langchain_core.tools import tool
 
 # Reuse HTTP utilities from brand_extractor (DRY principle)
 from app.services.brand_extractor import (
-    fetch_url,
+    fetch_page,
+    get_http_client,
+    normalize_url,
     parse_html,
     extract_text_content,
+    read_text_limited,
+    ResponseTooLarge,
+    NON_CONTENT_TAGS,
     USER_AGENT,
 )
 
@@ -40,11 +51,38 @@ from app.tools.task import get_agent_context
 
 logger = logging.getLogger(__name__)
 
+# orjson (installed with langsmith/langgraph) parses JSON-LD several times
+# faster; its JSONDecodeError subclasses json.JSONDecodeError
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
 
 # =============================================================================
 # USER WEBSITE TOOL (Get URL from Brain/Knowledge Base)
 # =============================================================================
 
+# Found websites are reused per user for this long (seconds)
+USER_WEBSITE_CACHE_TTL = 60
+
+# Cap on cached users; the oldest entries are dropped first
+USER_WEBSITE_CACHE_MAX_ENTRIES = 1024
+
+# user_id -> (cached_at, result)
+_user_website_cache: Dict[str, Tuple[float, dict]] = {}
+
+
+def invalidate_user_website_cache() -> None:
+    """
+    Forget all cached user websites.
+    
+    Call after brand settings are saved. The cache is keyed by user but
+    the website belongs to the organization, so everything is dropped.
+    """
+    _user_website_cache.clear()
+
+
 @tool
 async def get_user_website() -> dict:
     """
@@ -74,6 +112,12 @@ async def get_user_website() -> dict:
         }
     
     user_id = ctx.user_id
+    
+    # Agents often call this before every SEO tool in a session
+    cached = _user_website_cache.get(user_id)
+    if cached and time.monotonic() - cached[0] < USER_WEBSITE_CACHE_TTL:
+        return dict(cached[1])
+    
     service = get_knowledge_service()
     
     try:
@@ -89,12 +133,19 @@ async def get_user_website() -> dict:
         brand = await service.get_brand_settings(org_id)
         
         if brand.website:
-            return {
+            result = {
                 "has_website": True,
                 "website": brand.website,
                 "brand_name": brand.business_name or "Your Brand",
                 "message": f"Found website: {brand.website}",
             }
+            # Only found websites are cached, so a URL the user has just
+            # added in the Brain tab is picked up on the next call
+            _user_website_cache.pop(user_id, None)
+            while len(_user_website_cache) >= USER_WEBSITE_CACHE_MAX_ENTRIES:
+                del _user_website_cache[next(iter(_user_website_cache))]
+            _user_website_cache[user_id] = (time.monotonic(), result)
+            return dict(result)
         else:
             return {
                 "has_website": False,
@@ -127,6 +178,16 @@ SCORE_WEIGHTS = {
     "mobile": 0.10,
 }
 
+# Priority order of categories for reported issues (lower first)
+CATEGORY_PRIORITY = {
+    "meta_tags": 1,
+    "headings": 2,
+    "content": 3,
+    "images": 4,
+    "links": 5,
+    "mobile": 6,
+}
+
 # Ideal ranges for SEO elements
 TITLE_MIN_LENGTH = 30
 TITLE_MAX_LENGTH = 60
@@ -139,6 +200,19 @@ DESCRIPTION_IDEAL_LENGTH = 155
 MIN_WORD_COUNT = 300
 IDEAL_WORD_COUNT = 800
 
+# Example image sources to include for images missing alt text
+MAX_IMAGES_TO_REPORT = 3
+
+HEADING_TAGS = ('h1', 'h2', 'h3', 'h4', 'h5', 'h6')
+
+# Tags the analyzers inspect, gathered in one tree walk by index_tags()
+INDEXED_TAGS = (
+    'title', 'meta', 'link',
+    *HEADING_TAGS,
+    'p', 'ul', 'ol', 'strong', 'b', 'em',
+    'img', 'a',
+)
+
 # Key page patterns for site crawl
 KEY_PAGE_PATTERNS = [
     r"/about",
@@ -149,51 +223,244 @@ KEY_PAGE_PATTERNS = [
     r"/pricing",
     r"/features",
 ]
+# All patterns as one alternation, so each path is scanned once
+KEY_PAGE_RE = re.compile('|'.join(f'(?:{pattern})' for pattern in KEY_PAGE_PATTERNS), re.IGNORECASE)
+
+# check_technical_seo only reads JSON-LD blocks from the homepage
+JSON_LD_STRAINER = SoupStrainer('script', attrs={'type': 'application/ld+json'})
+
+# Fetched pages are reused across tool calls for this long (seconds)
+PAGE_CACHE_TTL = 300
+PAGE_CACHE_MAX_ENTRIES = 128
+
+# Maximum simultaneous outbound page fetches from the SEO tools
+MAX_CONCURRENT_FETCHES = 20
+
+# Maximum simultaneous page fetches within one site crawl
+SITE_CRAWL_CONCURRENCY = 5
+
+# Size cap for robots.txt/sitemaps: the sitemap protocol allows 50MB
+# uncompressed, more than the HTML page limit
+MAX_TEXT_FILE_SIZE = 50 * 1024 * 1024
 
 
 # =============================================================================
 # ADDITIONAL HTTP UTILITIES (specific to SEO tools)
 # =============================================================================
 
-async def fetch_text_file(url: str, timeout: float = 15.0) -> Tuple[str, int]:
+async def fetch_text_file(url: str, timeout: float = 15.0) -> Tuple[str, int, bool]:
     """
     Fetch a text file (robots.txt, sitemap.xml) with error handling.
     
     This is specific to SEO tools - fetches plain text/XML files
-    with appropriate Accept headers.
+    with appropriate Accept headers, up to MAX_TEXT_FILE_SIZE.
     
     Args:
-        url: The URL to fetch
+        url: The URL to fetch (with scheme)
         timeout: Request timeout in seconds
         
     Returns:
-        Tuple of (content, status_code)
+        Tuple of (content, status_code, too_large). A body over the size
+        limit comes back as ("", status_code, True) rather than as a
+        failed fetch ("", 0, False).
     """
-    if not url.startswith(('http://', 'https://')):
-        url = 'https://' + url
-    
     headers = {
         'User-Agent': USER_AGENT,
         'Accept': 'text/plain, text/xml, application/xml',
     }
     
     try:
-        async with httpx.AsyncClient(
-            follow_redirects=True,
-            timeout=timeout,
-        ) as client:
-            response = await client.get(url, headers=headers)
-            return response.text, response.status_code
+        client = get_http_client()
+        async with client.stream('GET', url, headers=headers, timeout=timeout) as response:
+            try:
+                content = await read_text_limited(response, MAX_TEXT_FILE_SIZE)
+            except ResponseTooLarge as e:
+                logger.warning(f"Skipping oversized {url}: {e}")
+                return "", response.status_code, True
+            return content, response.status_code, False
     except Exception as e:
         logger.warning(f"Failed to fetch {url}: {e}")
-        return "", 0
+        return "", 0, False
+
+
+@dataclass
+class PageBundle:
+    """
+    A fetched page together with its parsed tree, text and analysis.
+    
+    Shared between SEO tools so a page that several tools look at is
+    downloaded, parsed and analyzed once per cache lifetime. Each piece
+    is built on first access, so tools that only need a few elements
+    can parse a filtered tree from the HTML instead. The soup and the
+    analysis are treated as read-only. Once the analysis is built the
+    soup is dropped, and later soup accesses return a fresh parse that
+    is not kept, so cached bundles don't pin whole parse trees. The
+    properties may be evaluated in worker threads; two racing callers
+    just build the same value.
+    """
+    url: str
+    html: str
+    status_code: int
+    content_type: str = ''
+    _soup: Optional[BeautifulSoup] = field(default=None, repr=False)
+    _text: Optional[str] = field(default=None, repr=False)
+    _analysis: Optional["PageAnalysis"] = field(default=None, repr=False)
+    
+    @property
+    def soup(self) -> BeautifulSoup:
+        """Full parse tree of the page."""
+        if self._soup is not None:
+            return self._soup
+        soup = parse_html(self.html)
+        if self._analysis is None:
+            self._soup = soup
+        return soup
+    
+    @property
+    def text(self) -> str:
+        """Readable text content of the page."""
+        if self._text is None:
+            self._text = extract_text_content(self.soup)
+        return self._text
+    
+    @property
+    def analysis(self) -> "PageAnalysis":
+        """Results of all single-page analyzers for the page."""
+        if self._analysis is None:
+            self._analysis = run_page_analysis(self)
+            self._soup = None
+        return self._analysis
+    
+    @property
+    def is_html(self) -> bool:
+        """Whether the body is HTML (assumed when no Content-Type was sent)."""
+        return not self.content_type or 'html' in self.content_type.lower()
+    
+    @property
+    def is_parsed(self) -> bool:
+        """Whether the full parse tree has already been built."""
+        return self._soup is not None
+
+
+# url -> (fetched_at, bundle), insertion-ordered oldest first
+_page_cache: Dict[str, Tuple[float, PageBundle]] = {}
+
+# url -> task currently loading it, so concurrent callers share one fetch
+_inflight_pages: Dict[str, "asyncio.Task[PageBundle]"] = {}
+
+# Bounds outbound page fetches across all concurrent tool calls
+_fetch_semaphore = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+
+
+async def get_page(url: str, refresh: bool = False) -> PageBundle:
+    """
+    Fetch and parse a page, reusing a recent result for the same URL.
+    
+    Concurrent calls for the same URL are coalesced into a single fetch.
+    Only successful (HTTP 200) HTML pages are cached. Fetch errors
+    propagate to the caller, as with fetch_page.
+    
+    Args:
+        url: The page URL (with scheme)
+        refresh: Ignore any cached copy and fetch the page again
+        
+    Returns:
+        PageBundle for the URL
+    """
+    cached = _page_cache.get(url)
+    if cached and not refresh and time.monotonic() - cached[0] < PAGE_CACHE_TTL:
+        return cached[1]
+    
+    task = _inflight_pages.get(url)
+    if task is None:
+        task = asyncio.create_task(_load_page(url))
+        _inflight_pages[url] = task
+        task.add_done_callback(lambda done: _forget_inflight(url, done))
+    
+    # Shield so one caller being cancelled doesn't cancel the shared fetch
+    return await asyncio.shield(task)
+
+
+def _forget_inflight(url: str, task: "asyncio.Task[PageBundle]") -> None:
+    """Drop a finished load from the in-flight map."""
+    if _inflight_pages.get(url) is task:
+        del _inflight_pages[url]
+
+
+async def _load_page(url: str) -> PageBundle:
+    """Fetch and cache a page (see get_page)."""
+    async with _fetch_semaphore:
+        html, status_code, content_type = await fetch_page(url)
+    
+    bundle = PageBundle(url=url, html=html, status_code=status_code, content_type=content_type)
+    if status_code != 200 or not bundle.is_html:
+        return bundle
+    
+    # An expired or refreshed entry whose HTML is unchanged keeps its parse
+    # tree and analysis, so only the download is repeated
+    previous = _page_cache.pop(url, None)
+    if previous and previous[1].html == html:
+        bundle = previous[1]
+    
+    # Re-insert so the entry moves to the end, then drop the oldest entries
+    while len(_page_cache) >= PAGE_CACHE_MAX_ENTRIES:
+        del _page_cache[next(iter(_page_cache))]
+    _page_cache[url] = (time.monotonic(), bundle)
+    
+    return bundle
+
 
 
 # =============================================================================
 # ANALYSIS HELPERS
 # =============================================================================
 
-def analyze_meta_tags(soup, url: str) -> dict:
+def index_tags(soup) -> Dict[str, list]:
+    """
+    Group the tags the analyzers need by name, in document order.
+    
+    One walk over the tree replaces a separate find_all() per analyzer
+    and tag name. Analyzers accept the index so run_page_analysis can
+    build it once; called on their own they build it themselves.
+    
+    Like extract_text_content, skips scripts, styles and page chrome
+    (header, footer, nav) with their whole subtree, so a logo <h1> or
+    navigation links don't count towards the page's own content.
+    """
+    index = {name: [] for name in INDEXED_TAGS}
+    
+    # Iterative pre-order walk, so skipped elements are pruned with their subtree
+    stack = [iter(soup.contents)]
+    while stack:
+        for node in stack[-1]:
+            if type(node) is Tag and node.name not in NON_CONTENT_TAGS:
+                bucket = index.get(node.name)
+                if bucket is not None:
+                    bucket.append(node)
+                stack.append(iter(node.contents))
+                break
+        else:
+            stack.pop()
+    
+    return index
+
+
+def first_by_attr(elements: list, attr: str) -> Dict[str, Tag]:
+    """
+    Map each value of an attribute to the first element carrying it.
+    
+    Equivalent to soup.find(name, attrs={attr: value}) for every value
+    at once, e.g. all <meta name=...> lookups from one pass over the metas.
+    """
+    found = {}
+    for element in elements:
+        value = element.get(attr)
+        if value is not None and value not in found:
+            found[value] = element
+    return found
+
+
+def analyze_meta_tags(soup, url: str, tags: Optional[Dict[str, list]] = None) -> dict:
     """
     Analyze meta tags for SEO best practices.
     
@@ -202,8 +469,14 @@ def analyze_meta_tags(soup, url: str) -> dict:
     issues = []
     score = 100
     
+    if tags is None:
+        tags = index_tags(soup)
+    
+    meta_by_name = first_by_attr(tags['meta'], 'name')
+    meta_by_property = first_by_attr(tags['meta'], 'property')
+    
     # Title analysis
-    title_tag = soup.find('title')
+    title_tag = tags['title'][0] if tags['title'] else None
     title_value = title_tag.get_text(strip=True) if title_tag else None
     title_length = len(title_value) if title_value else 0
     
@@ -227,7 +500,7 @@ def analyze_meta_tags(soup, url: str) -> dict:
         score -= 5
     
     # Meta description analysis
-    desc_tag = soup.find('meta', attrs={'name': 'description'})
+    desc_tag = meta_by_name.get('description')
     desc_value = desc_tag.get('content', '').strip() if desc_tag else None
     desc_length = len(desc_value) if desc_value else 0
     
@@ -251,7 +524,10 @@ def analyze_meta_tags(soup, url: str) -> dict:
         score -= 5
     
     # Canonical tag
-    canonical_tag = soup.find('link', rel='canonical')
+    canonical_tag = next(
+        (link for link in tags['link'] if 'canonical' in link.get('rel', ())),
+        None,
+    )
     canonical_value = canonical_tag.get('href') if canonical_tag else None
     
     canonical_info = {
@@ -265,7 +541,7 @@ def analyze_meta_tags(soup, url: str) -> dict:
         score -= 10
     
     # Robots meta
-    robots_tag = soup.find('meta', attrs={'name': 'robots'})
+    robots_tag = meta_by_name.get('robots')
     robots_value = robots_tag.get('content', '').lower() if robots_tag else None
     
     robots_info = {
@@ -281,7 +557,7 @@ def analyze_meta_tags(soup, url: str) -> dict:
     # Open Graph tags
     og_tags = {}
     for prop in ['og:title', 'og:description', 'og:image', 'og:url', 'og:type']:
-        og_tag = soup.find('meta', property=prop)
+        og_tag = meta_by_property.get(prop)
         if og_tag:
             og_tags[prop] = og_tag.get('content', '')
     
@@ -306,7 +582,7 @@ def analyze_meta_tags(soup, url: str) -> dict:
     }
 
 
-def analyze_headings(soup) -> dict:
+def analyze_headings(soup, tags: Optional[Dict[str, list]] = None) -> dict:
     """
     Analyze heading structure for SEO best practices.
     
@@ -315,15 +591,14 @@ def analyze_headings(soup) -> dict:
     issues = []
     score = 100
     
+    if tags is None:
+        tags = index_tags(soup)
+    
     # Count all headings
-    heading_counts = {}
-    for level in range(1, 7):
-        headings = soup.find_all(f'h{level}')
-        heading_counts[f'h{level}'] = len(headings)
+    heading_counts = {name: len(tags[name]) for name in HEADING_TAGS}
     
     h1_count = heading_counts['h1']
-    h1_tags = soup.find_all('h1')
-    h1_texts = [h.get_text(strip=True)[:100] for h in h1_tags]
+    h1_texts = [h.get_text(strip=True)[:100] for h in tags['h1']]
     
     # Check H1
     if h1_count == 0:
@@ -336,8 +611,8 @@ def analyze_headings(soup) -> dict:
     # Check heading hierarchy
     hierarchy_issues = []
     prev_level = 0
-    for level in range(1, 7):
-        if heading_counts[f'h{level}'] > 0:
+    for level, name in enumerate(HEADING_TAGS, start=1):
+        if heading_counts[name] > 0:
             if prev_level > 0 and level > prev_level + 1:
                 hierarchy_issues.append(f"Skipped heading level: H{prev_level} to H{level}")
             prev_level = level
@@ -361,18 +636,24 @@ def analyze_headings(soup) -> dict:
     }
 
 
-def analyze_content(soup, text: str) -> dict:
+def analyze_content(soup, text: str, tags: Optional[Dict[str, list]] = None) -> dict:
     """
     Analyze content for SEO best practices.
     
+    `text` is the page text from extract_text_content, whose words are
+    separated by single spaces.
+    
     Returns dict with word_count, readability hints, score, issues
     """
     issues = []
     score = 100
     
-    # Word count
-    words = text.split()
-    word_count = len(words)
+    if tags is None:
+        tags = index_tags(soup)
+    
+    # Word count (the text is single-spaced, so count separators instead
+    # of splitting it into a list of words)
+    word_count = text.count(' ') + 1 if text else 0
     
     content_status = "good"
     if word_count < MIN_WORD_COUNT:
@@ -384,20 +665,17 @@ def analyze_content(soup, text: str) -> dict:
         score -= 5
     
     # Check for paragraphs
-    paragraphs = soup.find_all('p')
-    paragraph_count = len(paragraphs)
+    paragraph_count = len(tags['p'])
     
     if paragraph_count < 3 and word_count > 100:
         issues.append("Few paragraph tags - break content into readable sections")
         score -= 10
     
     # Check for lists (good for readability)
-    lists = soup.find_all(['ul', 'ol'])
-    has_lists = len(lists) > 0
+    has_lists = bool(tags['ul'] or tags['ol'])
     
     # Check for bold/emphasis (good for scannability)
-    emphasis = soup.find_all(['strong', 'b', 'em'])
-    has_emphasis = len(emphasis) > 0
+    has_emphasis = bool(tags['strong'] or tags['b'] or tags['em'])
     
     return {
         "word_count": word_count,
@@ -410,7 +688,7 @@ def analyze_content(soup, text: str) -> dict:
     }
 
 
-def analyze_images(soup) -> dict:
+def analyze_images(soup, tags: Optional[Dict[str, list]] = None) -> dict:
     """
     Analyze images for SEO best practices.
     
@@ -419,28 +697,35 @@ def analyze_images(soup) -> dict:
     issues = []
     score = 100
     
-    images = soup.find_all('img')
+    if tags is None:
+        tags = index_tags(soup)
+    
+    images = tags['img']
     total_images = len(images)
     
+    # Single pass: count everything, keep only the first few examples
     missing_alt = []
-    empty_alt = []
+    missing_count = 0
+    empty_count = 0
     has_lazy_loading = 0
     
     for img in images:
-        src = img.get('src', img.get('data-src', ''))
-        alt = img.get('alt')
+        # Read the attribute dict directly rather than through Tag.get()
+        attrs = img.attrs
+        alt = attrs.get('alt')
         
         if alt is None:
-            missing_alt.append(src[:50] if src else "unknown")
+            missing_count += 1
+            if missing_count <= MAX_IMAGES_TO_REPORT:
+                # Only reported examples need their source
+                src = attrs.get('src', attrs.get('data-src', ''))
+                missing_alt.append(src[:50] if src else "unknown")
         elif alt.strip() == '':
-            empty_alt.append(src[:50] if src else "unknown")
+            empty_count += 1
         
-        if img.get('loading') == 'lazy' or img.get('data-lazy'):
+        if attrs.get('loading') == 'lazy' or attrs.get('data-lazy'):
             has_lazy_loading += 1
     
-    missing_count = len(missing_alt)
-    empty_count = len(empty_alt)
-    
     if missing_count > 0:
         issues.append(f"{missing_count} image(s) missing alt attribute - add descriptive alt text")
         score -= min(30, missing_count * 5)
@@ -453,14 +738,14 @@ def analyze_images(soup) -> dict:
         "total": total_images,
         "missing_alt_count": missing_count,
         "empty_alt_count": empty_count,
-        "missing_alt_examples": missing_alt[:3],
+        "missing_alt_examples": missing_alt,
         "lazy_loading_count": has_lazy_loading,
         "score": max(0, score),
         "issues": issues,
     }
 
 
-def analyze_links(soup, base_url: str) -> dict:
+def analyze_links(soup, base_url: str, tags: Optional[Dict[str, list]] = None) -> dict:
     """
     Analyze links for SEO best practices.
     
@@ -469,39 +754,40 @@ def analyze_links(soup, base_url: str) -> dict:
     issues = []
     score = 100
     
+    if tags is None:
+        tags = index_tags(soup)
+    
     parsed_base = urlparse(base_url)
     base_domain = parsed_base.netloc.lower()
     
-    links = soup.find_all('a', href=True)
+    links = [link for link in tags['a'] if link.get('href') is not None]
+    
+    internal_count = 0
+    external_count = 0
+    nofollow_count = 0
     
-    internal_links = []
-    external_links = []
-    nofollow_links = []
+    # netloc -> is internal; pages link to few hosts, so compare each once
+    internal_hosts = {'': True}
     
     for link in links:
-        href = link.get('href', '')
-        rel = link.get('rel', [])
+        href = link['href']
         
         # Skip anchors and javascript
-        if href.startswith('#') or href.startswith('javascript:'):
+        if href.startswith(('#', 'javascript:')):
             continue
         
-        # Parse the link
-        parsed_href = urlparse(href)
-        
         # Determine if internal or external
-        if parsed_href.netloc == '' or parsed_href.netloc.lower() == base_domain:
-            internal_links.append(href)
+        netloc = urlparse(href).netloc
+        is_internal = internal_hosts.get(netloc)
+        if is_internal is None:
+            is_internal = internal_hosts[netloc] = netloc.lower() == base_domain
+        
+        if is_internal:
+            internal_count += 1
         else:
-            external_links.append({
-                "url": href[:100],
-                "nofollow": 'nofollow' in rel,
-            })
-            if 'nofollow' in rel:
-                nofollow_links.append(href)
-    
-    internal_count = len(internal_links)
-    external_count = len(external_links)
+            external_count += 1
+            if 'nofollow' in link.get('rel', ()):
+                nofollow_count += 1
     
     if internal_count < 3:
         issues.append("Few internal links - add more links to other pages on your site")
@@ -520,14 +806,14 @@ def analyze_links(soup, base_url: str) -> dict:
     return {
         "internal_count": internal_count,
         "external_count": external_count,
-        "nofollow_count": len(nofollow_links),
+        "nofollow_count": nofollow_count,
         "total": len(links),
         "score": max(0, score),
         "issues": issues,
     }
 
 
-def analyze_mobile(soup) -> dict:
+def analyze_mobile(soup, tags: Optional[Dict[str, list]] = None) -> dict:
     """
     Analyze mobile-friendliness indicators.
     
@@ -536,8 +822,11 @@ def analyze_mobile(soup) -> dict:
     issues = []
     score = 100
     
+    if tags is None:
+        tags = index_tags(soup)
+    
     # Check viewport meta
-    viewport = soup.find('meta', attrs={'name': 'viewport'})
+    viewport = first_by_attr(tags['meta'], 'name').get('viewport')
     has_viewport = viewport is not None
     viewport_content = viewport.get('content', '') if viewport else None
     
@@ -575,29 +864,80 @@ def get_priority_issues(analysis: dict, max_issues: int = 5) -> list[dict]:
     """Extract and prioritize top issues from analysis."""
     all_issues = []
     
-    # Define priority order for categories
-    category_priority = {
-        "meta_tags": 1,
-        "headings": 2,
-        "content": 3,
-        "images": 4,
-        "links": 5,
-        "mobile": 6,
-    }
-    
     for category, data in analysis.items():
         if isinstance(data, dict) and "issues" in data:
+            priority = CATEGORY_PRIORITY.get(category, 10)
             for issue in data["issues"]:
                 all_issues.append({
                     "category": category,
                     "issue": issue,
-                    "priority": category_priority.get(category, 10),
+                    "priority": priority,
                 })
     
-    # Sort by priority
-    all_issues.sort(key=lambda x: x["priority"])
+    # Partial selection of the highest-priority issues (stable, like sorted()[:n])
+    return heapq.nsmallest(max_issues, all_issues, key=itemgetter("priority"))
+
+
+@dataclass(slots=True)
+class PageAnalysis:
+    """
+    Results of all single-page analyzers for one URL.
+    
+    Used internally by the SEO tools and converted to a plain dict
+    at the tool boundary via to_dict(). The analysis is cached with
+    its page, so to_dict() hands out copies callers may modify.
+    """
+    url: str
+    meta_tags: dict
+    headings: dict
+    content: dict
+    images: dict
+    links: dict
+    mobile: dict
+    overall_score: int = 0
+    priority_issues: list[dict] = field(default_factory=list)
+    
+    def categories(self) -> Dict[str, dict]:
+        """Per-category results keyed by category name."""
+        return {
+            "meta_tags": self.meta_tags,
+            "headings": self.headings,
+            "content": self.content,
+            "images": self.images,
+            "links": self.links,
+            "mobile": self.mobile,
+        }
     
-    return all_issues[:max_issues]
+    def to_dict(self) -> dict:
+        """Convert to the analyze_page_seo result shape."""
+        return copy.deepcopy({
+            "url": self.url,
+            **self.categories(),
+            "overall_score": self.overall_score,
+            "priority_issues": self.priority_issues,
+        })
+
+
+def run_page_analysis(page: PageBundle) -> PageAnalysis:
+    """Run every single-page analyzer on a fetched page."""
+    soup = page.soup
+    tags = index_tags(soup)
+    
+    analysis = PageAnalysis(
+        url=page.url,
+        meta_tags=analyze_meta_tags(soup, page.url, tags),
+        headings=analyze_headings(soup, tags),
+        content=analyze_content(soup, page.text, tags),
+        images=analyze_images(soup, tags),
+        links=analyze_links(soup, page.url, tags),
+        mobile=analyze_mobile(soup, tags),
+    )
+    
+    categories = analysis.categories()
+    analysis.overall_score = calculate_overall_score(categories)
+    analysis.priority_issues = get_priority_issues(categories)
+    
+    return analysis
 
 
 def extract_key_pages(soup, base_url: str, max_pages: int = 5) -> list[str]:
@@ -605,19 +945,27 @@ def extract_key_pages(soup, base_url: str, max_pages: int = 5) -> list[str]:
     Extract key internal pages for site-wide analysis.
     
     Looks for common important pages like about, services, contact, blog.
+    Returns the base URL followed by matches in the order they appear on
+    the page, which puts primary navigation first.
     """
     parsed_base = urlparse(base_url)
     base_domain = parsed_base.netloc.lower()
     base_scheme = parsed_base.scheme
     
     links = soup.find_all('a', href=True)
-    found_pages = set()
+    # Insertion-ordered set of pages found so far, base URL first
+    found_pages = {base_url: None}
+    seen_hrefs = set()  # Nav/footer links repeat; parse each href once
     
     for link in links:
         href = link.get('href', '')
         
-        # Skip external, anchors, javascript
-        if href.startswith(('#', 'javascript:', 'mailto:', 'tel:')):
+        if href in seen_hrefs:
+            continue
+        seen_hrefs.add(href)
+        
+        # Skip anchors and non-page links
+        if href.startswith(('#', 'javascript:', 'mailto:', 'tel:', 'data:')):
             continue
         
         # Parse and normalize
@@ -627,32 +975,71 @@ def extract_key_pages(soup, base_url: str, max_pages: int = 5) -> list[str]:
         if parsed.netloc and parsed.netloc.lower() != base_domain:
             continue
         
-        # Build full URL
-        if not parsed.netloc:
-            full_url = urljoin(base_url, href)
+        # Path of the full URL, without query params and fragments
+        if parsed.netloc:
+            clean_path = parsed.path
         else:
-            full_url = href
-        
-        # Remove query params and fragments for comparison
-        clean_url = urlparse(full_url)
-        clean_path = clean_url.path.rstrip('/')
+            clean_path = urlparse(urljoin(base_url, href)).path
+        clean_path = clean_path.rstrip('/')
         
         # Check if matches key page pattern
-        for pattern in KEY_PAGE_PATTERNS:
-            if re.search(pattern, clean_path, re.IGNORECASE):
-                normalized_url = f"{base_scheme}://{base_domain}{clean_path}"
-                found_pages.add(normalized_url)
+        if KEY_PAGE_RE.search(clean_path):
+            normalized_url = f"{base_scheme}://{base_domain}{clean_path}"
+            found_pages.setdefault(normalized_url, None)
+            if len(found_pages) >= max_pages:
                 break
     
-    # Add base URL if not already included
-    base_normalized = f"{base_scheme}://{base_domain}"
-    result = [base_url]
+    return list(found_pages)[:max_pages]
+
+
+async def analyze_crawled_page(
+    page_url: str,
+    semaphore: asyncio.Semaphore,
+    page: Optional[PageBundle] = None,
+) -> Tuple[dict, Optional[PageAnalysis]]:
+    """
+    Fetch and analyze one page of a site crawl.
+    
+    Args:
+        page_url: The page URL (with scheme)
+        semaphore: Limits concurrent fetches within the crawl
+        page: An already fetched page (the homepage) to analyze as is
+        
+    Returns:
+        Tuple of (summary for page_results, analysis or None if the
+        page could not be analyzed)
+    """
+    logger.info(f"Analyzing: {page_url}")
     
-    for page in list(found_pages)[:max_pages - 1]:
-        if page not in result:
-            result.append(page)
+    try:
+        if page is None:
+            async with semaphore:
+                page = await get_page(page_url)
+            if page.status_code != 200:
+                return {"error": f"HTTP {page.status_code}", "score": 0}, None
+            if not page.is_html:
+                return {"error": f"Not HTML ({page.content_type})", "score": 0}, None
+        
+        # Run analysis (reused if the page was analyzed recently) in a
+        # worker thread, so pages analyze while others are still downloading
+        analysis = await asyncio.to_thread(lambda: page.analysis)
+    except Exception as e:
+        logger.error(f"Failed to analyze {page_url}: {e}")
+        return {"error": str(e), "score": 0}, None
+    
+    categories = analysis.categories()
+    
+    summary = {
+        "score": analysis.overall_score,
+        "meta_tags_score": analysis.meta_tags["score"],
+        "headings_score": analysis.headings["score"],
+        "content_score": analysis.content["score"],
+        "word_count": analysis.content["word_count"],
+        "images_score": analysis.images["score"],
+        "issues_count": sum(len(data["issues"]) for data in categories.values()),
+    }
     
-    return result[:max_pages]
+    return summary, analysis
 
 
 # =============================================================================
@@ -660,7 +1047,7 @@ def extract_key_pages(soup, base_url: str, max_pages: int = 5) -> list[str]:
 # =============================================================================
 
 @tool
-async def analyze_page_seo(url: str) -> dict:
+async def analyze_page_seo(url: str, refresh: bool = False) -> dict:
     """
     Analyze a single page for SEO issues.
     
@@ -672,8 +1059,12 @@ async def analyze_page_seo(url: str) -> dict:
     - Analyzing a landing page or blog post
     - Quick SEO health check
     
+    Results for a URL are reused for a few minutes. Pass refresh=True
+    when the user has just changed the page and wants a fresh scan.
+    
     Args:
         url: The URL to analyze (e.g., "example.com" or "https://example.com/page")
+        refresh: Re-fetch the page instead of using a recent result (default False)
     
     Returns:
         dict with:
@@ -689,12 +1080,10 @@ async def analyze_page_seo(url: str) -> dict:
     """
     logger.info(f"Analyzing page SEO for: {url}")
     
-    # Normalize URL
-    if not url.startswith(('http://', 'https://')):
-        url = 'https://' + url
+    url = normalize_url(url)
     
     try:
-        html, status_code = await fetch_url(url)
+        page = await get_page(url, refresh=refresh)
     except Exception as e:
         logger.error(f"Failed to fetch {url}: {e}")
         return {
@@ -703,36 +1092,28 @@ async def analyze_page_seo(url: str) -> dict:
             "url": url,
         }
     
-    if status_code != 200:
+    if page.status_code != 200:
         return {
             "error": "http_error",
-            "error_detail": f"HTTP {status_code}",
+            "error_detail": f"HTTP {page.status_code}",
             "url": url,
         }
     
-    soup = parse_html(html)
-    text = extract_text_content(soup)
-    
-    # Run all analyses
-    analysis = {
-        "url": url,
-        "meta_tags": analyze_meta_tags(soup, url),
-        "headings": analyze_headings(soup),
-        "content": analyze_content(soup, text),
-        "images": analyze_images(soup),
-        "links": analyze_links(soup, url),
-        "mobile": analyze_mobile(soup),
-    }
-    
-    # Calculate overall score
-    analysis["overall_score"] = calculate_overall_score(analysis)
+    # PDFs, images etc. would only produce a meaningless parse
+    if not page.is_html:
+        return {
+            "error": "not_html",
+            "error_detail": f"Content-Type {page.content_type}",
+            "url": url,
+        }
     
-    # Get priority issues
-    analysis["priority_issues"] = get_priority_issues(analysis)
+    # Run all analyses (score and priority issues included), once per fetch.
+    # Parsing and analysis are CPU-bound, so keep them off the event loop.
+    analysis = await asyncio.to_thread(lambda: page.analysis)
     
-    logger.info(f"Page analysis complete for {url}: score {analysis['overall_score']}/100")
+    logger.info(f"Page analysis complete for {url}: score {analysis.overall_score}/100")
     
-    return analysis
+    return analysis.to_dict()
 
 
 @tool
@@ -763,15 +1144,13 @@ async def analyze_site_seo(url: str, max_pages: int = 5) -> dict:
     """
     logger.info(f"Starting site SEO analysis for: {url}")
     
-    # Normalize URL
-    if not url.startswith(('http://', 'https://')):
-        url = 'https://' + url
+    url = normalize_url(url)
     
-    max_pages = min(max_pages, 10)  # Cap at 10
+    max_pages = max(1, min(max_pages, 10))  # Keep between 1 and 10
     
     # Fetch homepage first
     try:
-        html, status_code = await fetch_url(url)
+        homepage = await get_page(url)
     except Exception as e:
         logger.error(f"Failed to fetch homepage {url}: {e}")
         return {
@@ -780,97 +1159,67 @@ async def analyze_site_seo(url: str, max_pages: int = 5) -> dict:
             "site_url": url,
         }
     
-    if status_code != 200:
+    if homepage.status_code != 200:
         return {
             "error": "http_error",
-            "error_detail": f"HTTP {status_code}",
+            "error_detail": f"HTTP {homepage.status_code}",
             "site_url": url,
         }
     
-    soup = parse_html(html)
+    if not homepage.is_html:
+        return {
+            "error": "not_html",
+            "error_detail": f"Content-Type {homepage.content_type}",
+            "site_url": url,
+        }
     
-    # Find key pages to analyze
-    pages_to_analyze = extract_key_pages(soup, url, max_pages)
+    # Find key pages to analyze (parses the homepage, so run it in a worker thread)
+    pages_to_analyze = await asyncio.to_thread(
+        lambda: extract_key_pages(homepage.soup, url, max_pages)
+    )
     logger.info(f"Found {len(pages_to_analyze)} pages to analyze: {pages_to_analyze}")
     
-    # Analyze each page
+    # Fetch and analyze pages concurrently, a few fetches at a time
+    semaphore = asyncio.Semaphore(SITE_CRAWL_CONCURRENCY)
+    results = await asyncio.gather(*(
+        analyze_crawled_page(page_url, semaphore, homepage if page_url == url else None)
+        for page_url in pages_to_analyze
+    ))
+    
     page_results = {}
-    all_issues = {}  # Track issues across pages
+    all_issues = defaultdict(list)  # issue -> pages it appears on
     total_score = 0
     
-    for page_url in pages_to_analyze:
-        logger.info(f"Analyzing: {page_url}")
+    for page_url, (summary, analysis) in zip(pages_to_analyze, results):
+        page_results[page_url] = summary
+        if analysis is None:
+            continue
         
-        try:
-            if page_url == url:
-                # Reuse already fetched homepage
-                page_soup = soup
-                page_html = html
-            else:
-                page_html, page_status = await fetch_url(page_url)
-                if page_status != 200:
-                    page_results[page_url] = {
-                        "error": f"HTTP {page_status}",
-                        "score": 0,
-                    }
-                    continue
-                page_soup = parse_html(page_html)
-            
-            page_text = extract_text_content(page_soup)
-            
-            # Run analysis
-            analysis = {
-                "meta_tags": analyze_meta_tags(page_soup, page_url),
-                "headings": analyze_headings(page_soup),
-                "content": analyze_content(page_soup, page_text),
-                "images": analyze_images(page_soup),
-                "links": analyze_links(page_soup, page_url),
-                "mobile": analyze_mobile(page_soup),
-            }
-            
-            page_score = calculate_overall_score(analysis)
-            total_score += page_score
-            
-            # Collect issues for common issue detection
-            for category, data in analysis.items():
-                if isinstance(data, dict) and "issues" in data:
-                    for issue in data["issues"]:
-                        if issue not in all_issues:
-                            all_issues[issue] = []
-                        all_issues[issue].append(page_url)
-            
-            page_results[page_url] = {
-                "score": page_score,
-                "meta_tags_score": analysis["meta_tags"]["score"],
-                "headings_score": analysis["headings"]["score"],
-                "content_score": analysis["content"]["score"],
-                "word_count": analysis["content"]["word_count"],
-                "images_score": analysis["images"]["score"],
-                "issues_count": sum(len(d.get("issues", [])) for d in analysis.values() if isinstance(d, dict)),
-            }
-            
-        except Exception as e:
-            logger.error(f"Failed to analyze {page_url}: {e}")
-            page_results[page_url] = {
-                "error": str(e),
-                "score": 0,
-            }
+        total_score += analysis.overall_score
+        
+        # Collect issues for common issue detection
+        for data in analysis.categories().values():
+            for issue in data["issues"]:
+                all_issues[issue].append(page_url)
     
     # Calculate overall site score
     analyzed_count = len([r for r in page_results.values() if "score" in r and r["score"] > 0])
     overall_score = round(total_score / analyzed_count) if analyzed_count > 0 else 0
     
-    # Find common issues (appearing on 2+ pages)
-    common_issues = [
-        {
-            "issue": issue,
-            "affected_pages": len(pages),
-            "pages": pages[:3],  # Limit to 3 examples
-        }
-        for issue, pages in all_issues.items()
-        if len(pages) >= 2
-    ]
-    common_issues.sort(key=lambda x: x["affected_pages"], reverse=True)
+    # Find common issues (appearing on 2+ pages), most widespread first
+    common_issues = heapq.nlargest(
+        5,
+        (
+            {
+                "issue": issue,
+                "affected_pages": len(pages),
+                "pages": pages[:3],  # Limit to 3 examples
+            }
+            for issue, pages in all_issues.items()
+            if len(pages) >= 2
+        ),
+        key=itemgetter("affected_pages"),
+    )
     
     # Generate recommendations
     recommendations = []
@@ -899,7 +1248,7 @@ async def analyze_site_seo(url: str, max_pages: int = 5) -> dict:
         "pages_count": len(pages_to_analyze),
         "overall_score": overall_score,
         "page_results": page_results,
-        "common_issues": common_issues[:5],
+        "common_issues": common_issues,
         "recommendations": recommendations,
     }
 
@@ -929,9 +1278,7 @@ async def check_technical_seo(url: str) -> dict:
     """
     logger.info(f"Checking technical SEO for: {url}")
     
-    # Normalize URL
-    if not url.startswith(('http://', 'https://')):
-        url = 'https://' + url
+    url = normalize_url(url)
     
     parsed = urlparse(url)
     base_url = f"{parsed.scheme}://{parsed.netloc}"
@@ -939,10 +1286,24 @@ async def check_technical_seo(url: str) -> dict:
     issues = []
     score = 100
     
-    # Check robots.txt
     robots_url = f"{base_url}/robots.txt"
-    robots_content, robots_status = await fetch_text_file(robots_url)
+    sitemap_urls = [
+        f"{base_url}/sitemap.xml",
+        f"{base_url}/sitemap_index.xml",
+    ]
     
+    # The fetches are independent, so run them all at once. Only get_page can
+    # raise (fetch_text_file never does); its error is returned here and
+    # reported by the structured data check below. Gathering them together
+    # means a cancelled tool call cancels every fetch with it.
+    homepage, (robots_content, robots_status, robots_too_large), *sitemap_results = await asyncio.gather(
+        get_page(url),
+        fetch_text_file(robots_url),
+        *(fetch_text_file(sitemap_url) for sitemap_url in sitemap_urls),
+        return_exceptions=True,
+    )
+    
+    # Check robots.txt
     robots_info = {
         "url": robots_url,
         "exists": robots_status == 200,
@@ -952,35 +1313,29 @@ async def check_technical_seo(url: str) -> dict:
         "issues": [],
     }
     
-    if robots_status == 200 and robots_content:
-        robots_lower = robots_content.lower()
+    if robots_status == 200 and robots_too_large:
+        robots_info["issues"].append("robots.txt is over 50MB - too large to check")
+        issues.append("Oversized robots.txt")
+    elif robots_status == 200 and robots_content:
+        # Distinct directive lines, lowercased once
+        robots_lines = {line.strip() for line in robots_content.lower().splitlines()}
         
         # Check for sitemap reference
-        if 'sitemap:' in robots_lower:
+        if any(line.startswith('sitemap:') for line in robots_lines):
             robots_info["has_sitemap_reference"] = True
         
-        # Check for problematic rules
-        if 'disallow: /' in robots_lower and 'disallow: / ' not in robots_lower:
-            # Check if it's blocking everything
-            lines = robots_lower.split('\n')
-            for line in lines:
-                if line.strip() == 'disallow: /':
-                    robots_info["blocks_important"] = True
-                    robots_info["issues"].append("robots.txt may be blocking all crawlers")
-                    issues.append("robots.txt blocking all crawlers")
-                    score -= 30
-                    break
+        # Check for a rule blocking everything
+        if 'disallow: /' in robots_lines:
+            robots_info["blocks_important"] = True
+            robots_info["issues"].append("robots.txt may be blocking all crawlers")
+            issues.append("robots.txt blocking all crawlers")
+            score -= 30
     else:
         robots_info["issues"].append("No robots.txt found - consider adding one")
         issues.append("Missing robots.txt")
         score -= 5
     
-    # Check sitemap
-    sitemap_urls = [
-        f"{base_url}/sitemap.xml",
-        f"{base_url}/sitemap_index.xml",
-    ]
-    
+    # Check sitemap (first candidate that exists)
     sitemap_info = {
         "exists": False,
         "url": None,
@@ -988,8 +1343,18 @@ async def check_technical_seo(url: str) -> dict:
         "issues": [],
     }
     
-    for sitemap_url in sitemap_urls:
-        sitemap_content, sitemap_status = await fetch_text_file(sitemap_url)
+    for sitemap_url, (sitemap_content, sitemap_status, sitemap_too_large) in zip(sitemap_urls, sitemap_results):
+        if sitemap_status == 200 and sitemap_too_large:
+            # Present, but past the protocol's size limit, so not counted
+            sitemap_info["exists"] = True
+            sitemap_info["url"] = sitemap_url
+            sitemap_info["url_count"] = None
+            sitemap_info["issues"].append(
+                "Sitemap is larger than 50MB (the sitemap protocol limit) - split it using a sitemap index"
+            )
+            issues.append("Oversized sitemap")
+            score -= 5
+            break
         
         if sitemap_status == 200 and sitemap_content:
             sitemap_info["exists"] = True
@@ -1013,9 +1378,17 @@ async def check_technical_seo(url: str) -> dict:
     
     # Check homepage for structured data
     try:
-        html, status = await fetch_url(url)
-        if status == 200:
-            soup = parse_html(html)
+        if isinstance(homepage, Exception):
+            raise homepage
+        status = homepage.status_code
+        if status == 200 and homepage.is_html:
+            # Reuse a full tree if another tool built one, else parse only JSON-LD
+            if homepage.is_parsed:
+                soup = homepage.soup
+            else:
+                soup = await asyncio.to_thread(
+                    parse_html, homepage.html, parse_only=JSON_LD_STRAINER
+                )
             
             # Find JSON-LD structured data
             json_ld_scripts = soup.find_all('script', type='application/ld+json')
@@ -1029,7 +1402,8 @@ async def check_technical_seo(url: str) -> dict:
             
             for script in json_ld_scripts:
                 try:
-                    data = json.loads(script.string or '{}')
+                    # orjson only accepts exact str, not NavigableString
+                    data = json_loads(str(script.string or '{}'))
                     if isinstance(data, dict):
                         schema_type = data.get('@type', 'Unknown')
                         structured_data_info["types"].append(schema_type)
@@ -1044,6 +1418,10 @@ async def check_technical_seo(url: str) -> dict:
                 structured_data_info["issues"].append("No structured data found - add schema.org markup")
                 issues.append("Missing structured data")
                 score -= 10
+        elif status == 200:
+            structured_data_info = {
+                "error": f"Homepage is not HTML: {homepage.content_type}",
+            }
         else:
             structured_data_info = {
                 "error": f"Could not fetch homepage: HTTP {status}",
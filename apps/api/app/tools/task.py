@@ -15,7 +15,9 @@ from __future__ import annotations
 
 import logging
 from contextvars import ContextVar
+from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional, Any
 
 from langchain_core.tools import tool
@@ -37,6 +39,7 @@ _agent_context_var: ContextVar[Optional["AgentContext"]] = ContextVar(
 )
 
 
+@dataclass(frozen=True, slots=True)
 class AgentContext:
     """
     Runtime context for the executing agent.
@@ -46,19 +49,12 @@ class AgentContext:
     
     Uses contextvars for thread-safety in concurrent async environments.
     Each request gets isolated context - no cross-request contamination.
+    Immutable, so one instance can be shared by every tool call in a run.
     """
-    
-    def __init__(
-        self,
-        agent_slug: str,
-        user_id: str,
-        org_id: Optional[str] = None,
-        thread_id: Optional[str] = None,
-    ):
-        self.agent_slug = agent_slug
-        self.user_id = user_id
-        self.org_id = org_id
-        self.thread_id = thread_id
+    agent_slug: str
+    user_id: str
+    org_id: Optional[str] = None
+    thread_id: Optional[str] = None
     
     @classmethod
     def set_current(cls, context: "AgentContext") -> None:
@@ -90,7 +86,7 @@ def set_agent_context(
     
     Thread-safe: Uses contextvars for per-request isolation.
     
-    Returns the created context.
+    Returns the active context (the existing one if it is identical).
     """
     context = AgentContext(
         agent_slug=agent_slug,
@@ -98,6 +94,10 @@ def set_agent_context(
         org_id=org_id,
         thread_id=thread_id,
     )
+    current = AgentContext.get_current()
+    if current == context:
+        return current
+    
     AgentContext.set_current(context)
     return context
 
@@ -116,6 +116,10 @@ def get_agent_context() -> Optional[AgentContext]:
 # TASK CREATION TOOL
 # =============================================================================
 
+# Listed in unknown-task_type errors; the schemas are fixed at import
+_KNOWN_TASK_TYPES = ", ".join(CONTENT_SCHEMAS)
+
+
 @tool
 async def create_task(
     task_type: str,
@@ -175,27 +179,32 @@ async def create_task(
     
     # Validate task_type is known (for better error messages)
     if task_type not in CONTENT_SCHEMAS:
-        known_types = ", ".join(CONTENT_SCHEMAS.keys())
         return {
             "success": False,
-            "error": f"Unknown task_type '{task_type}'. Known types: {known_types}",
+            "error": f"Unknown task_type '{task_type}'. Known types: {_KNOWN_TASK_TYPES}",
         }
     
     # Parse due_date if provided
     parsed_due_date = None
     if due_date:
         try:
-            # Try ISO format
-            parsed_due_date = datetime.fromisoformat(due_date.replace("Z", "+00:00"))
+            if len(due_date) == 10 and due_date[4] == "-" and due_date[7] == "-":
+                # Date only (the common case)
+                parsed_due_date = datetime(
+                    int(due_date[:4]), int(due_date[5:7]), int(due_date[8:])
+                )
+            else:
+                try:
+                    # Try ISO format (accepts a trailing "Z" on Python 3.11+)
+                    parsed_due_date = datetime.fromisoformat(due_date)
+                except ValueError:
+                    # Try date only (unpadded, e.g. 2026-1-5)
+                    parsed_due_date = datetime.strptime(due_date, "%Y-%m-%d")
         except ValueError:
-            try:
-                # Try date only
-                parsed_due_date = datetime.strptime(due_date, "%Y-%m-%d")
-            except ValueError:
-                return {
-                    "success": False,
-                    "error": f"Invalid due_date format: {due_date}. Use YYYY-MM-DD or ISO format.",
-                }
+            return {
+                "success": False,
+                "error": f"Invalid due_date format: {due_date}. Use YYYY-MM-DD or ISO format.",
+            }
     
     try:
         # Get task service
@@ -215,8 +224,8 @@ async def create_task(
         )
         
         logger.info(
-            f"Agent {context.agent_slug} created task {task['id']} "
-            f"({task_type}) for user {context.user_id}"
+            "Agent %s created task %s (%s) for user %s",
+            context.agent_slug, task["id"], task_type, context.user_id,
         )
         
         return {
@@ -228,7 +237,7 @@ async def create_task(
         }
         
     except Exception as e:
-        logger.error(f"Failed to create task: {e}")
+        logger.error("Failed to create task: %s", e)
         return {
             "success": False,
             "error": str(e),
@@ -246,6 +255,15 @@ def get_task_types() -> dict:
     Returns:
         dict mapping task_type to schema info including required fields.
     """
+    # Shared and read-only: the result is only serialized into the tool
+    # message. Not wrapped in MappingProxyType, which the tool output
+    # serializer would render as a Python repr instead of JSON.
+    return _describe_task_types()
+
+
+@lru_cache
+def _describe_task_types() -> dict:
+    """Build the get_task_types result once; the schemas are fixed at import."""
     result = {}
     
     for task_type, schema in CONTENT_SCHEMAS.items():
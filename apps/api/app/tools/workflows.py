@@ -10,9 +10,10 @@ Tools:
 from __future__ import annotations
 
 import logging
+from typing import Optional
 
 from langchain_core.tools import tool
-from langchain_core.messages import HumanMessage
+from langchain_core.messages import AIMessage, HumanMessage
 
 from app.tools.task import get_agent_context
 from app.schemas.subagent import (
@@ -24,6 +25,52 @@ from app.schemas.subagent import (
 
 logger = logging.getLogger(__name__)
 
+# Shorthand platform names accepted from the supervisor, mapped to canonical names
+_PLATFORM_ALIASES = {
+    "x": "twitter",
+    "fb": "facebook",
+    "insta": "instagram",
+    "ig": "instagram",
+    "li": "linkedin",
+}
+
+
+def _normalize_platform(platform: str) -> str:
+    """Lowercase a platform name and resolve shorthand aliases (x -> twitter)."""
+    platform_lower = platform.lower().strip()
+    return _PLATFORM_ALIASES.get(platform_lower, platform_lower)
+
+
+# Fixed part of generate_image error results, dumped from the schema once
+# so error paths only fill in per-call fields
+_IMAGE_ERROR_BASE = ImageTaskOutput(
+    success=False,
+    status="error",
+    prompt_used="",
+    aspect_ratio="1:1",
+    dimensions="1080x1080",
+).model_dump()
+
+
+def _image_error(
+    description: str,
+    style: str,
+    platform: str,
+    message: str,
+    error: str,
+    error_detail: Optional[str] = None,
+) -> dict:
+    """Build a generate_image error result (ImageTaskOutput shape)."""
+    return {
+        **_IMAGE_ERROR_BASE,
+        "prompt_used": description,
+        "style": style,
+        "platform": platform,
+        "message": message,
+        "error": error,
+        "error_detail": error_detail,
+    }
+
 
 # =============================================================================
 # IMAGE GENERATION SUBAGENT TOOL
@@ -72,14 +119,12 @@ async def generate_image(
         - User: "Make an Instagram graphic with a quote"
           -> generate_image("motivational quote about success", platform="instagram", style="quote_card")
     """
-    from app.agents.image_gen import create_image_gen_agent
+    from app.agents.image_gen import get_image_gen_agent
     
-    logger.info(f"generate_image called - platform: {platform}, style: {style}")
+    logger.info("generate_image called - platform: %s, style: %s", platform, style)
     
     # Normalize platform
-    platform_lower = platform.lower().strip()
-    aliases = {"x": "twitter", "fb": "facebook", "insta": "instagram", "ig": "instagram", "li": "linkedin"}
-    platform_normalized = aliases.get(platform_lower, platform_lower)
+    platform_normalized = _normalize_platform(platform)
     
     # Get user context for brand lookups
     ctx = get_agent_context()
@@ -99,69 +144,54 @@ async def generate_image(
     task_json = build_image_message(task)
     
     try:
-        # Create and invoke the image generation subagent
-        image_agent = create_image_gen_agent()
+        # Invoke the (shared) image generation subagent
+        image_agent = get_image_gen_agent()
         
         result = await image_agent.ainvoke({
             "messages": [HumanMessage(content=task_json)]
         })
         
-        # Extract the final message from the subagent
+        # Prefer the typed result from the subagent's response_format
+        structured = result.get("structured_response")
+        if isinstance(structured, ImageTaskOutput):
+            logger.info("Image generation completed with status: %s", structured.status)
+            return structured.model_dump()
+        
+        # Otherwise extract the final message from the subagent
         messages = result.get("messages", [])
         if not messages:
             logger.warning("Image generation agent returned no messages")
-            return ImageTaskOutput(
-                success=False,
-                status="error",
-                prompt_used=description,
-                style=style,
-                aspect_ratio="1:1",
-                platform=platform_normalized,
-                dimensions="1080x1080",
+            return _image_error(
+                description, style, platform_normalized,
                 message="Image generation returned no response",
                 error="no_messages",
-            ).model_dump()
+            )
         
-        # Get the last AI message (the final response)
+        # Get the last AI message with content (the final response)
         final_content = None
         for msg in reversed(messages):
-            if hasattr(msg, "content") and msg.content:
-                # Skip tool messages
-                if hasattr(msg, "type") and msg.type == "tool":
-                    continue
+            if isinstance(msg, AIMessage) and msg.content:
                 final_content = msg.content
                 break
         
         if not final_content:
             logger.warning("No final message found in image generation result")
-            return ImageTaskOutput(
-                success=False,
-                status="error",
-                prompt_used=description,
-                style=style,
-                aspect_ratio="1:1",
-                platform=platform_normalized,
-                dimensions="1080x1080",
+            return _image_error(
+                description, style, platform_normalized,
                 message="Image generation completed but no result found",
                 error="no_final_message",
-            ).model_dump()
+            )
         
         # Parse structured result
         parsed = parse_image_result(final_content, fallback_description=description)
-        logger.info(f"Image generation completed with status: {parsed.status}")
+        logger.info("Image generation completed with status: %s", parsed.status)
         return parsed.model_dump()
         
     except Exception as e:
-        logger.error(f"Image generation subagent failed: {e}", exc_info=True)
-        return ImageTaskOutput(
-            success=False,
-            status="error",
-            prompt_used=description,
-            style=style,
-            aspect_ratio="1:1",
-            platform=platform_normalized,
-            dimensions="1080x1080",
+        logger.error("Image generation subagent failed: %s", e, exc_info=True)
+        return _image_error(
+            description, style, platform_normalized,
             message=f"Image generation failed: {str(e)}",
             error="subagent_failed",
             error_detail=str(e),
-        ).model_dump()
+        )
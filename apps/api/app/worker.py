@@ -72,7 +72,7 @@ import asyncio
 import signal
 import sys
 import logging
-from datetime import datetime
+from datetime import datetime, timezone
 
 # Configure logging
 logging.basicConfig(
@@ -98,11 +98,11 @@ async def startup_check():
     
     # List existing jobs
     jobs = get_scheduled_jobs()
-    logger.info(f"📋 Found {len(jobs)} scheduled jobs in database")
+    logger.info("📋 Found %d scheduled jobs in database", len(jobs))
     for job in jobs[:5]:  # Show first 5
-        logger.info(f"   - Task {job['task_id']} scheduled for {job['next_run_time']}")
+        logger.info("   - Task %s scheduled for %s", job["task_id"], job["next_run_time"])
     if len(jobs) > 5:
-        logger.info(f"   ... and {len(jobs) - 5} more")
+        logger.info("   ... and %d more", len(jobs) - 5)
     
     return True
 
@@ -128,17 +128,14 @@ async def run_scheduler():
     # Keep running until interrupted
     stop_event = asyncio.Event()
     
-    def handle_stop():
-        logger.info("🛑 Received shutdown signal...")
-        stop_event.set()
-    
     # Register signal handlers for graceful shutdown
     loop = asyncio.get_running_loop()
     for sig in (signal.SIGINT, signal.SIGTERM):
-        loop.add_signal_handler(sig, handle_stop)
+        loop.add_signal_handler(sig, stop_event.set)
     
     try:
         await stop_event.wait()
+        logger.info("🛑 Received shutdown signal...")
     finally:
         logger.info("Shutting down scheduler...")
         scheduler.shutdown(wait=True)
@@ -155,7 +152,7 @@ def main():
     logger.info("   Only ONE instance should run at a time.")
     logger.info("   Do NOT scale this horizontally!")
     logger.info("")
-    logger.info(f"⏰ Started at: {datetime.utcnow().isoformat()}Z")
+    logger.info("⏰ Started at: %s", datetime.now(timezone.utc).isoformat(timespec="seconds"))
     logger.info("")
     logger.info("Supported platforms:")
     logger.info("   • Instagram")
@@ -2,7 +2,7 @@
 Content Creation Workflow
 
 LangGraph-based workflow implementing three advanced patterns:
-1. Parallelization - Research tasks run simultaneously via asyncio.gather()
+1. Parallelization - Research tasks run simultaneously via asyncio.TaskGroup
 2. Prompt Chaining - Sequential content creation pipeline
 3. Evaluator-Optimizer - Quality loop with feedback (max 3 iterations)
 
@@ -14,14 +14,14 @@ Workflow Steps:
    - research_competitor: Competitive analysis framework
 2. validate_research - Ensure we have sufficient research data
 3. create_brief - Synthesize research into actionable content brief
-4. generate_draft - LLM creates initial content following brief
-5. evaluate_content - LLM grades quality (platform fit, engagement, clarity, CTA)
-6. refine_content - Incorporate feedback (loops back to evaluate, max 3x)
+4. generate_draft - LLM writes the first draft and grades it in one structured call
+5. refine_content - Incorporate feedback (max 3 iterations)
+6. evaluate_content - LLM grades each refinement (platform fit, engagement, clarity, CTA)
 7. polish_final - Final formatting, hashtag formatting, metadata
 8. create_task - Save to workspace as pending_approval task
 
 This workflow can be invoked as an agent by Soshie supervisor.
-The parallel research pattern uses asyncio.gather() for true concurrent execution.
+The parallel research pattern uses asyncio.TaskGroup for true concurrent execution.
 """
 
 from __future__ import annotations
@@ -46,6 +46,7 @@ from app.schemas.content_workflow import (
     ContentBrief,
     DraftContent,
     ContentFeedback,
+    DraftWithFeedback,
     FinalContent,
 )
 
@@ -75,6 +76,9 @@ WORKFLOW_CAPABILITIES = {
     ],
 }
 
+# Set form of supported_platforms for membership checks
+SUPPORTED_PLATFORMS = frozenset(WORKFLOW_CAPABILITIES["supported_platforms"])
+
 
 # =============================================================================
 # WORKFLOW STATE
@@ -199,15 +203,19 @@ async def validate_request(state: ContentWorkflowState) -> dict:
             "unsupported_platforms": [],
         }
     
-    # Normalize platforms to lowercase
-    platforms = [p.lower() for p in platforms if p]
+    # Normalize platforms to lowercase, dropping repeats (order preserved)
+    platforms = list(dict.fromkeys(p.lower() for p in platforms if p))
     
     # ---------------------------------------------------------------------------
     # Step 2: Check if platforms are supported
     # ---------------------------------------------------------------------------
-    supported = WORKFLOW_CAPABILITIES["supported_platforms"]
-    supported_requested = [p for p in platforms if p in supported]
-    unsupported_requested = [p for p in platforms if p not in supported]
+    supported_requested = []
+    unsupported_requested = []
+    for p in platforms:
+        if p in SUPPORTED_PLATFORMS:
+            supported_requested.append(p)
+        else:
+            unsupported_requested.append(p)
     
     if unsupported_requested:
         logger.info(f"Unsupported platforms requested: {unsupported_requested}")
@@ -341,6 +349,58 @@ def route_after_validation(state: ContentWorkflowState) -> str:
 # RESEARCH NODES (Parallel Execution)
 # =============================================================================
 
+# Platform-specific hashtag guidelines
+HASHTAG_GUIDELINES = {
+    "instagram": {"max": 10, "tip": "Mix popular with niche tags"},
+    "twitter": {"max": 2, "tip": "1-2 highly relevant tags only"},
+    "linkedin": {"max": 5, "tip": "Professional, industry-specific"},
+    "tiktok": {"max": 5, "tip": "Include trending + topic hashtags"},
+    "facebook": {"max": 3, "tip": "Sparingly, focus on content"},
+}
+
+# Platform-specific posting-time data
+POSTING_TIMES = {
+    "instagram": {
+        "best_days": ["Tuesday", "Wednesday", "Thursday"],
+        "best_hours": ["11am-1pm", "7pm-9pm"],
+        "avoid": "Late night (12am-6am)",
+        "note": "Stories perform best in morning, Reels in evening",
+    },
+    "linkedin": {
+        "best_days": ["Tuesday", "Wednesday", "Thursday"],
+        "best_hours": ["7am-8am", "12pm", "5pm-6pm"],
+        "avoid": "Weekends and late evenings",
+        "note": "B2B content performs best mid-week mornings",
+    },
+    "twitter": {
+        "best_days": ["Tuesday", "Wednesday", "Thursday"],
+        "best_hours": ["8am-10am", "12pm-1pm"],
+        "avoid": "Weekends (lower engagement)",
+        "note": "News/trends peak early morning",
+    },
+    "tiktok": {
+        "best_days": ["Tuesday", "Thursday", "Friday"],
+        "best_hours": ["7pm-9pm", "12pm-3pm"],
+        "avoid": "Early mornings",
+        "note": "Younger audience most active in evenings",
+    },
+    "facebook": {
+        "best_days": ["Wednesday", "Thursday", "Friday"],
+        "best_hours": ["9am-1pm"],
+        "avoid": "Late night",
+        "note": "Engagement drops significantly on weekends",
+    },
+}
+
+# Platform-specific content format tips
+FORMAT_TIPS = {
+    "instagram": "Carousels get 3x more engagement. Reels reach 2x more people.",
+    "linkedin": "Document posts (PDF carousels) get 3x more clicks.",
+    "twitter": "Threads perform well for long-form. Images boost engagement 150%.",
+    "tiktok": "Trend-based content and tutorials perform best. Keep under 60s.",
+}
+
+
 async def research_hashtags(state: ResearchTaskState) -> dict:
     """
     Research relevant hashtags for the topic and platform.
@@ -350,16 +410,7 @@ async def research_hashtags(state: ResearchTaskState) -> dict:
     topic = state.get("topic", "")
     platform = state.get("platform", "instagram").lower()
     
-    # Platform-specific hashtag guidelines
-    guidelines = {
-        "instagram": {"max": 10, "tip": "Mix popular with niche tags"},
-        "twitter": {"max": 2, "tip": "1-2 highly relevant tags only"},
-        "linkedin": {"max": 5, "tip": "Professional, industry-specific"},
-        "tiktok": {"max": 5, "tip": "Include trending + topic hashtags"},
-        "facebook": {"max": 3, "tip": "Sparingly, focus on content"},
-    }
-    
-    guide = guidelines.get(platform, guidelines["instagram"])
+    guide = HASHTAG_GUIDELINES.get(platform, HASHTAG_GUIDELINES["instagram"])
     
     # Generate topic-based hashtags
     topic_lower = topic.lower().replace(" ", "")
@@ -391,48 +442,14 @@ async def research_timing(state: ResearchTaskState) -> dict:
     platform = state.get("platform", "instagram").lower()
     content_type = state.get("content_type", "post")
     
-    # Platform-specific timing data
-    timing_data = {
-        "instagram": {
-            "best_days": ["Tuesday", "Wednesday", "Thursday"],
-            "best_hours": ["11am-1pm", "7pm-9pm"],
-            "avoid": "Late night (12am-6am)",
-            "note": "Stories perform best in morning, Reels in evening",
-        },
-        "linkedin": {
-            "best_days": ["Tuesday", "Wednesday", "Thursday"],
-            "best_hours": ["7am-8am", "12pm", "5pm-6pm"],
-            "avoid": "Weekends and late evenings",
-            "note": "B2B content performs best mid-week mornings",
-        },
-        "twitter": {
-            "best_days": ["Tuesday", "Wednesday", "Thursday"],
-            "best_hours": ["8am-10am", "12pm-1pm"],
-            "avoid": "Weekends (lower engagement)",
-            "note": "News/trends peak early morning",
-        },
-        "tiktok": {
-            "best_days": ["Tuesday", "Thursday", "Friday"],
-            "best_hours": ["7pm-9pm", "12pm-3pm"],
-            "avoid": "Early mornings",
-            "note": "Younger audience most active in evenings",
-        },
-        "facebook": {
-            "best_days": ["Wednesday", "Thursday", "Friday"],
-            "best_hours": ["9am-1pm"],
-            "avoid": "Late night",
-            "note": "Engagement drops significantly on weekends",
-        },
-    }
-    
-    times = timing_data.get(platform, timing_data["instagram"])
+    times = POSTING_TIMES.get(platform, POSTING_TIMES["instagram"])
     
     return {
         "timing_research": {
             "platform": platform,
             "content_type": content_type,
-            "best_days": times["best_days"],
-            "best_hours": times["best_hours"],
+            "best_days": list(times["best_days"]),
+            "best_hours": list(times["best_hours"]),
             "avoid": times["avoid"],
             "recommendation": times["note"],
         }
@@ -467,19 +484,12 @@ async def research_ideas(state: ResearchTaskState) -> dict:
         },
     ]
     
-    format_tips = {
-        "instagram": "Carousels get 3x more engagement. Reels reach 2x more people.",
-        "linkedin": "Document posts (PDF carousels) get 3x more clicks.",
-        "twitter": "Threads perform well for long-form. Images boost engagement 150%.",
-        "tiktok": "Trend-based content and tutorials perform best. Keep under 60s.",
-    }
-    
     return {
         "content_ideas": {
             "topic": topic,
             "platform": platform,
             "ideas": ideas,
-            "format_tip": format_tips.get(platform, "Match content to platform strengths."),
+            "format_tip": FORMAT_TIPS.get(platform, "Match content to platform strengths."),
         }
     }
 
@@ -516,9 +526,27 @@ async def research_competitor(state: ResearchTaskState) -> dict:
 # PARALLEL RESEARCH EXECUTION
 # =============================================================================
 
+# Research coroutines run by run_parallel_research
+RESEARCH_TASKS = (
+    research_hashtags,
+    research_timing,
+    research_ideas,
+    research_competitor,
+)
+
+
+async def _run_research_task(research_task, research_input: ResearchTaskState) -> Optional[dict]:
+    """Run one research task, logging failures so the others keep running."""
+    try:
+        return await research_task(research_input)
+    except Exception as e:
+        logger.warning(f"Research task failed: {e}")
+        return None
+
+
 async def run_parallel_research(state: ContentWorkflowState) -> dict:
     """
-    Run all research tasks in parallel using asyncio.gather().
+    Run all research tasks in parallel using an asyncio.TaskGroup.
     
     This is the production-standard way to parallelize multiple
     independent async operations in a single LangGraph node.
@@ -549,21 +577,17 @@ async def run_parallel_research(state: ContentWorkflowState) -> dict:
     
     # Run all research tasks concurrently
     try:
-        results = await asyncio.gather(
-            research_hashtags(research_input),
-            research_timing(research_input),
-            research_ideas(research_input),
-            research_competitor(research_input),
-            return_exceptions=True,  # Don't fail if one research fails
-        )
+        async with asyncio.TaskGroup() as tg:
+            tasks = [
+                tg.create_task(_run_research_task(research_task, research_input))
+                for research_task in RESEARCH_TASKS
+            ]
         
         # Merge results into state update
         state_update = {}
         
-        for result in results:
-            if isinstance(result, Exception):
-                logger.warning(f"Research task failed: {result}")
-                continue
+        for task in tasks:
+            result = task.result()
             if isinstance(result, dict):
                 state_update.update(result)
         
@@ -698,11 +722,40 @@ async def create_brief(state: ContentWorkflowState) -> dict:
 # DRAFT GENERATION NODE
 # =============================================================================
 
+# Scoring rubric shared by generate_draft and evaluate_content
+EVALUATION_CRITERIA = """Score each aspect from 1-10:
+1. Platform Fit: Does it follow {platform} conventions and best practices?
+2. Engagement Potential: Will it get likes, comments, shares?
+3. Clarity: Is the message clear and easy to understand?
+4. CTA Effectiveness: Does it have a compelling call-to-action?
+
+Grade as "pass" if average score is 7+ and no major issues.
+"""
+
+
+def _score_evaluation(evaluation: dict) -> dict:
+    """Add the overall (average) score to an evaluation dict and log it."""
+    scores = [
+        evaluation.get("platform_fit_score", 7),
+        evaluation.get("engagement_score", 7),
+        evaluation.get("clarity_score", 7),
+        evaluation.get("cta_score", 7),
+    ]
+    evaluation["overall_score"] = sum(scores) / len(scores)
+    
+    logger.info(f"Evaluation: {evaluation['grade']}, score: {evaluation['overall_score']:.1f}")
+    
+    return evaluation
+
+
 async def generate_draft(state: ContentWorkflowState) -> dict:
     """
     Generate initial content draft following the brief.
     
-    Uses LLM to create platform-appropriate content.
+    Uses LLM to create platform-appropriate content and grade it in the
+    same structured call, so the first pass skips evaluate_content. Falls
+    back to a plain draft plus a separate evaluation if structured output
+    fails.
     """
     if state.get("error"):
         return {}
@@ -726,7 +779,7 @@ async def generate_draft(state: ContentWorkflowState) -> dict:
     # Create prompt for draft generation
     llm = get_llm(streaming=False)
     
-    prompt = f"""Create a {platform} post about: {topic}
+    requirements = f"""Create a {platform} post about: {topic}
 
 Requirements:
 - Tone: {tone}
@@ -734,12 +787,30 @@ Requirements:
 - Include a strong hook in the first line
 - End with a call-to-action
 - Platform tips: {', '.join(tips)}
+"""
+    
+    # Write and grade the first draft in one call; refinements are
+    # graded by evaluate_content
+    prompt = f"""{requirements}
+Put ONLY the post content in "text". No explanations or meta-commentary.
 
+Then critically evaluate the post you wrote, as a strict {platform} editor would.
+{EVALUATION_CRITERIA.format(platform=platform)}
+"""
+    
+    evaluation = None
+    try:
+        structured_llm = llm.with_structured_output(DraftWithFeedback, method="function_calling")
+        result = await structured_llm.ainvoke([HumanMessage(content=prompt)])
+        generated_text = result.text.strip()
+        evaluation = result.evaluation.model_dump()
+    except Exception as e:
+        logger.warning(f"Combined draft and evaluation failed, drafting only: {e}")
+        prompt = f"""{requirements}
 Write ONLY the post content. No explanations or meta-commentary.
 """
-
-    response = await llm.ainvoke([HumanMessage(content=prompt)])
-    generated_text = response.content.strip()
+        response = await llm.ainvoke([HumanMessage(content=prompt)])
+        generated_text = response.content.strip()
     
     draft = {
         "platform": platform,
@@ -750,7 +821,16 @@ Write ONLY the post content. No explanations or meta-commentary.
         "call_to_action": brief.get("call_to_action", ""),
     }
     
-    return {"draft_content": draft, "iteration_count": 1}
+    if evaluation is None:
+        # Grade separately, as for refinements
+        graded = await evaluate_content({**state, "draft_content": draft, "iteration_count": 1})
+        return {"draft_content": draft, "iteration_count": 1, **graded}
+    
+    return {
+        "draft_content": draft,
+        "evaluation": _score_evaluation(evaluation),
+        "iteration_count": 1,
+    }
 
 
 # =============================================================================
@@ -787,12 +867,7 @@ async def evaluate_content(state: ContentWorkflowState) -> dict:
 POST:
 {text}
 
-Score each aspect from 1-10:
-1. Platform Fit: Does it follow {platform} conventions and best practices?
-2. Engagement Potential: Will it get likes, comments, shares?
-3. Clarity: Is the message clear and easy to understand?
-4. CTA Effectiveness: Does it have a compelling call-to-action?
-
+{EVALUATION_CRITERIA.format(platform=platform)}
 Respond in this exact JSON format:
 {{
     "grade": "pass" or "needs_improvement",
@@ -803,8 +878,6 @@ Respond in this exact JSON format:
     "feedback": "<specific improvement suggestions>",
     "issues": ["<issue 1>", "<issue 2>"]
 }}
-
-Grade as "pass" if average score is 7+ and no major issues.
 """
 
     response = await llm.ainvoke([HumanMessage(content=eval_prompt)])
@@ -843,18 +916,7 @@ Grade as "pass" if average score is 7+ and no major issues.
             "issues": [],
         }
     
-    # Calculate overall score
-    scores = [
-        evaluation.get("platform_fit_score", 7),
-        evaluation.get("engagement_score", 7),
-        evaluation.get("clarity_score", 7),
-        evaluation.get("cta_score", 7),
-    ]
-    evaluation["overall_score"] = sum(scores) / len(scores)
-    
-    logger.info(f"Evaluation: {evaluation['grade']}, score: {evaluation['overall_score']:.1f}")
-    
-    return {"evaluation": evaluation}
+    return {"evaluation": _score_evaluation(evaluation)}
 
 
 # =============================================================================
@@ -1359,7 +1421,7 @@ def create_content_workflow(
     
     This workflow implements:
     0. Request validation - Self-describing entry: checks platforms, support, connections
-    1. Parallel research - Uses asyncio.gather() to run all 4 research tasks simultaneously
+    1. Parallel research - Uses asyncio.TaskGroup to run all 4 research tasks simultaneously
     2. Prompt chaining - Sequential: brief -> draft -> polish
     3. Evaluator-optimizer loop - evaluate -> refine (max 3x until quality passes)
     4. Multi-platform adaptation - Create master content, adapt for other platforms in single LLM call
@@ -1397,7 +1459,7 @@ def create_content_workflow(
     workflow.add_node("validate_request", validate_request)
     
     # Research phase - single node that runs all 4 research tasks in parallel
-    # using asyncio.gather() for true simultaneous execution
+    # using asyncio.TaskGroup for true simultaneous execution
     workflow.add_node("parallel_research", run_parallel_research)
     workflow.add_node("validate_research", validate_research)
     
@@ -1436,9 +1498,16 @@ def create_content_workflow(
     workflow.add_edge("parallel_research", "validate_research")
     workflow.add_edge("validate_research", "create_brief")
     
-    # Content pipeline: brief -> draft -> evaluate
+    # Content pipeline: brief -> draft (graded in the same LLM call)
     workflow.add_edge("create_brief", "generate_draft")
-    workflow.add_edge("generate_draft", "evaluate_content")
+    workflow.add_conditional_edges(
+        "generate_draft",
+        route_after_evaluation,
+        {
+            "polish_final": "polish_final",
+            "refine_content": "refine_content",
+        }
+    )
     
     # Evaluation loop: pass -> polish, fail -> refine -> re-evaluate
     workflow.add_conditional_edges(
@@ -1496,6 +1565,50 @@ def create_content_workflow_agent(
 # CONVENIENCE FUNCTION
 # =============================================================================
 
+# Shared checkpointer-less workflow for run_content_workflow; the compiled
+# graph holds no per-run state
+_content_workflow = None
+
+
+def _get_content_workflow(checkpointer: Optional[BaseCheckpointSaver] = None):
+    """Return the shared compiled workflow, or a new one bound to a checkpointer."""
+    global _content_workflow
+    
+    if checkpointer is not None:
+        return create_content_workflow(checkpointer)
+    
+    if _content_workflow is None:
+        _content_workflow = create_content_workflow()
+    return _content_workflow
+
+
+# Immutable starting values for run_content_workflow; list fields are
+# supplied fresh on every call so runs never share state
+_INITIAL_STATE_DEFAULTS = {
+    # Connection check fields
+    "connections_checked": False,
+    "awaiting_user_choice": False,
+    # Research results
+    "hashtag_research": None,
+    "timing_research": None,
+    "content_ideas": None,
+    "competitor_insights": None,
+    # Pipeline stages
+    "content_brief": None,
+    "draft_content": None,
+    "evaluation": None,
+    "iteration_count": 0,
+    # Multi-platform output
+    "master_content": None,
+    "adapted_content": None,
+    "content_group_id": None,
+    # Legacy single-platform fields
+    "final_content": None,
+    "task_id": None,
+    "error": None,
+}
+
+
 async def run_content_workflow(
     request: str,
     platform: str = "linkedin",
@@ -1507,7 +1620,8 @@ async def run_content_workflow(
     """
     Run the content creation workflow.
     
-    Convenience function that creates and executes the workflow.
+    Convenience function that executes the workflow (compiled once and
+    reused when no checkpointer is given).
     
     Args:
         request: What to create (topic/description)
@@ -1520,11 +1634,12 @@ async def run_content_workflow(
     Returns:
         Final workflow state with results
     """
-    workflow = create_content_workflow(checkpointer)
+    workflow = _get_content_workflow(checkpointer)
     
     # Initial state with multi-platform support
     # For backward compatibility, single platform call sets platforms = [platform]
     initial_state: ContentWorkflowState = {
+        **_INITIAL_STATE_DEFAULTS,
         "request": request,
         "content_type": content_type,
         "user_id": user_id,
@@ -1532,36 +1647,15 @@ async def run_content_workflow(
         # Multi-platform fields
         "platforms": [platform],
         "master_platform": platform,
-        # Connection check fields
-        "connections_checked": False,
-        "connected_platforms": [],
-        "disconnected_platforms": [],
-        "awaiting_user_choice": False,
         # Legacy single-platform field (kept for compatibility)
         "platform": platform,
-        # Research results
-        "hashtag_research": None,
-        "timing_research": None,
-        "content_ideas": None,
-        "competitor_insights": None,
-        # Pipeline stages
-        "content_brief": None,
-        "draft_content": None,
-        "evaluation": None,
-        "iteration_count": 0,
-        # Multi-platform output
-        "master_content": None,
-        "adapted_content": None,
-        "content_group_id": None,
+        # Fresh lists per run (never shared through the template)
+        "connected_platforms": [],
+        "disconnected_platforms": [],
         "task_ids": [],
         "failed_platforms": [],
-        # Legacy single-platform fields
-        "final_content": None,
-        "task_id": None,
-        # Messages, UI actions, and error
         "messages": [],
         "ui_actions": [],
-        "error": None,
     }
     
     # Configure thread ID for checkpointing
@@ -0,0 +1,17 @@
+"""
+Shared pytest setup for the API tests.
+
+Settings require Supabase/database values at import time; tests never
+talk to those services, so placeholders are enough.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+os.environ.setdefault("SUPABASE_URL", "http://localhost")
+os.environ.setdefault("SUPABASE_SERVICE_KEY", "test")
+os.environ.setdefault("SUPABASE_JWT_SECRET", "test")
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/test")
@@ -0,0 +1,121 @@
+"""Tests for the content workflow graph (app/workflows/content_workflow.py)."""
+
+import asyncio
+import json
+
+import pytest
+from langchain_core.messages import AIMessage
+
+import app.agents.base as base
+from app.schemas.content_workflow import ContentFeedback, DraftWithFeedback
+from app.workflows import content_workflow
+
+PASSING_EVALUATION = {
+    "grade": "pass",
+    "platform_fit_score": 9,
+    "engagement_score": 9,
+    "clarity_score": 9,
+    "cta_score": 9,
+    "feedback": "",
+    "issues": [],
+}
+
+
+class FakeLLM:
+    """
+    Chat model stand-in for the draft, evaluate and refine nodes.
+
+    The combined draft+evaluation call returns `grade`, or raises when
+    `fail_structured` is set; plain calls return a draft or, for
+    evaluation prompts, a passing evaluation.
+    """
+
+    def __init__(self, grade: str = "pass", fail_structured: bool = False):
+        self.grade = grade
+        self.fail_structured = fail_structured
+        self.calls = []
+
+    def with_structured_output(self, schema, **kwargs):
+        return FakeStructured(self)
+
+    async def ainvoke(self, messages):
+        prompt = messages[0].content
+        if prompt.startswith("Evaluate"):
+            self.calls.append("evaluate")
+            return AIMessage(content=json.dumps(PASSING_EVALUATION))
+        if prompt.startswith("Improve"):
+            self.calls.append("refine")
+        else:
+            self.calls.append("draft")
+        return AIMessage(content="Plain draft\nBody text")
+
+
+class FakeStructured:
+    def __init__(self, llm: FakeLLM):
+        self.llm = llm
+
+    async def ainvoke(self, messages):
+        self.llm.calls.append("draft+evaluate")
+        if self.llm.fail_structured:
+            raise RuntimeError("structured output not supported")
+        return DraftWithFeedback(
+            text="Hook line\nBody text",
+            evaluation=ContentFeedback(
+                grade=self.llm.grade,
+                platform_fit_score=8,
+                engagement_score=8,
+                clarity_score=8,
+                cta_score=8,
+                feedback="Tighten the hook",
+                issues=[],
+            ),
+        )
+
+
+@pytest.fixture
+def run(monkeypatch):
+    """Run the workflow for a LinkedIn post against the given fake model."""
+    async def no_tasks(state):
+        return {"task_ids": [], "messages": []}
+
+    monkeypatch.setattr(content_workflow, "create_task_node", no_tasks)
+    monkeypatch.setattr(content_workflow, "_content_workflow", None)
+
+    def run_with(llm: FakeLLM) -> dict:
+        monkeypatch.setattr(base, "get_llm", lambda **kwargs: llm)
+        return asyncio.run(content_workflow.run_content_workflow(
+            "AI tools", platform="linkedin", user_id="",
+        ))
+
+    return run_with
+
+
+def test_passing_draft_takes_one_call(run):
+    llm = FakeLLM()
+
+    result = run(llm)
+
+    assert llm.calls == ["draft+evaluate"]
+    assert result["iteration_count"] == 1
+    assert result["evaluation"]["grade"] == "pass"
+    assert result["draft_content"]["text"].startswith("Hook line")
+
+
+def test_structured_failure_falls_back_to_draft_and_evaluate(run):
+    llm = FakeLLM(fail_structured=True)
+
+    result = run(llm)
+
+    assert llm.calls == ["draft+evaluate", "draft", "evaluate"]
+    assert result["evaluation"]["grade"] == "pass"
+    assert result["draft_content"]["text"].startswith("Plain draft")
+
+
+def test_needs_improvement_loops_through_refine(run):
+    llm = FakeLLM(grade="needs_improvement")
+
+    result = run(llm)
+
+    assert llm.calls == ["draft+evaluate", "refine", "evaluate"]
+    assert result["iteration_count"] == 2
+    assert result["evaluation"]["grade"] == "pass"
@@ -0,0 +1,105 @@
+"""Tests for the generate_image subagent tool (app/tools/workflows.py)."""
+
+import asyncio
+
+import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+import app.agents.image_gen as image_gen
+from app.agents.image_gen import create_image_gen_agent
+from app.schemas.subagent import ImageTaskOutput
+from app.tools.workflows import generate_image
+
+
+class FakeAgent:
+    """Stands in for the compiled image_gen agent."""
+
+    def __init__(self, result: dict):
+        self.result = result
+        self.calls = []
+
+    async def ainvoke(self, payload):
+        self.calls.append(payload)
+        return self.result
+
+
+class ToolCallingFakeModel(GenericFakeChatModel):
+    """Fake chat model that accepts tool binding (needed by create_agent)."""
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+
+@pytest.fixture
+def use_agent(monkeypatch):
+    def install(agent):
+        monkeypatch.setattr(image_gen, "_image_gen_agent", agent)
+        return agent
+    return install
+
+
+def run(**kwargs) -> dict:
+    return asyncio.run(generate_image.ainvoke({"description": "team meeting", **kwargs}))
+
+
+def test_returns_structured_response(use_agent):
+    structured = ImageTaskOutput(
+        status="success",
+        image_url="https://cdn.example.com/a.png",
+        prompt_used="optimized prompt",
+        platform="linkedin",
+    )
+    agent = use_agent(FakeAgent({
+        "messages": [AIMessage(content="ignored text {\"status\": \"error\"}")],
+        "structured_response": structured,
+    }))
+
+    result = run(platform="LI")
+
+    assert result == structured.model_dump()
+    task = agent.calls[0]["messages"][0]
+    assert isinstance(task, HumanMessage)
+    assert '"platform": "linkedin"' in task.content
+
+
+def test_falls_back_to_last_ai_message(use_agent):
+    use_agent(FakeAgent({
+        "messages": [
+            HumanMessage(content='{"task_type": "generate_image"}'),
+            AIMessage(content='Earlier: {"status": "error", "prompt_used": "old"}'),
+            ToolMessage(content='{"status": "tool"}', tool_call_id="1"),
+            AIMessage(content='Done: {"status": "success", "image_url": "https://x/y.png"} thanks {}'),
+        ],
+    }))
+
+    result = run()
+
+    assert result["status"] == "success"
+    assert result["success"] is True
+    assert result["image_url"] == "https://x/y.png"
+    assert result["prompt_used"] == "team meeting"
+
+
+def test_no_ai_message_is_an_error(use_agent):
+    use_agent(FakeAgent({"messages": [HumanMessage(content='{"task_type": "generate_image"}')]}))
+
+    result = run(style="minimal")
+
+    assert result["error"] == "no_final_message"
+    assert result["status"] == "error"
+    assert result["style"] == "minimal"
+
+
+def test_real_agent_returns_structured_response(use_agent):
+    final = AIMessage(content="", tool_calls=[{
+        "name": "ImageTaskOutput",
+        "args": {"status": "success", "prompt_used": "p", "image_url": "https://x/z.png"},
+        "id": "call-1",
+    }])
+    use_agent(create_image_gen_agent(model=ToolCallingFakeModel(messages=iter([final]))))
+
+    result = run()
+
+    assert result["status"] == "success"
+    assert result["image_url"] == "https://x/z.png"
@@ -0,0 +1,264 @@
+"""Tests for the SEO audit tools (app/tools/seo_tools.py)."""
+
+import asyncio
+
+import httpx
+import pytest
+
+import app.services.brand_extractor as brand_extractor
+import app.services.knowledge_service as knowledge_service
+from app.routers import knowledge
+from app.services.knowledge_service import BrandSettings
+from app.tools import seo_tools
+from app.tools.task import clear_agent_context, set_agent_context
+
+HOMEPAGE = """<!DOCTYPE html><html><head><title>Example</title>
+<script type="application/ld+json">{"@type": "Organization"}</script>
+</head><body><main><h1>Hello</h1><p>Some content here.</p></main></body></html>"""
+
+ROBOTS = "User-agent: *\nDisallow: /admin\nSitemap: https://example.com/sitemap.xml\n"
+SITEMAP = "<urlset>" + "".join(
+    f"<url><loc>https://example.com/p{i}</loc></url>" for i in range(3)
+) + "</urlset>"
+
+
+@pytest.fixture
+def site(monkeypatch):
+    """Serve a small fake site through the shared HTTP client."""
+    routes = {
+        "/": (200, HOMEPAGE, "text/html; charset=utf-8"),
+        "/robots.txt": (200, ROBOTS, "text/plain"),
+        "/sitemap.xml": (200, SITEMAP, "application/xml"),
+    }
+    
+    def handler(request: httpx.Request) -> httpx.Response:
+        status, body, content_type = routes.get(
+            request.url.path, (404, "not found", "text/html")
+        )
+        return httpx.Response(status, text=body, headers={"content-type": content_type})
+    
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(brand_extractor, "_http_client", client)
+    monkeypatch.setattr(seo_tools, "_page_cache", {})
+    monkeypatch.setattr(seo_tools, "_inflight_pages", {})
+    return routes
+
+
+CHROME_PAGE = """<html><head><title>Chrome</title></head><body>
+<header><h1><img src="/logo.png" alt="">Brand</h1></header>
+<nav><a href="/about">About</a><a href="/blog">Blog</a><a href="/contact">Contact</a></nav>
+<main><h1>Page title</h1><p>Body <a href="/pricing">pricing</a></p></main>
+<footer><a href="https://twitter.com/example">Twitter</a></footer>
+<script>document.write('<a href="/x">x</a>')</script>
+</body></html>"""
+
+
+@pytest.fixture
+def fetches(monkeypatch):
+    """Replace fetch_page with a fake that counts calls and can be held open."""
+    state = {"calls": 0, "release": None, "error": None}
+    
+    async def fake_fetch_page(url):
+        state["calls"] += 1
+        if state["release"] is not None:
+            await state["release"].wait()
+        if state["error"] is not None:
+            raise state["error"]
+        return HOMEPAGE, 200, "text/html"
+    
+    monkeypatch.setattr(seo_tools, "fetch_page", fake_fetch_page)
+    monkeypatch.setattr(seo_tools, "_page_cache", {})
+    monkeypatch.setattr(seo_tools, "_inflight_pages", {})
+    return state
+
+
+def check(url: str = "https://example.com") -> dict:
+    return asyncio.run(seo_tools.check_technical_seo.ainvoke({"url": url}))
+
+
+def test_technical_seo_counts_sitemap(site):
+    result = check()
+    
+    assert result["sitemap"]["exists"] is True
+    assert result["sitemap"]["url_count"] == 3
+    assert result["robots_txt"]["has_sitemap_reference"] is True
+    assert result["structured_data"]["types"] == ["Organization"]
+    assert result["score"] == 100
+
+
+def test_oversized_sitemap_is_reported_not_missing(site, monkeypatch):
+    monkeypatch.setattr(seo_tools, "MAX_TEXT_FILE_SIZE", len(SITEMAP) - 1)
+    
+    result = check()
+    sitemap = result["sitemap"]
+    
+    assert sitemap["exists"] is True
+    assert sitemap["url"] == "https://example.com/sitemap.xml"
+    assert sitemap["url_count"] is None
+    assert "Missing sitemap.xml" not in result["issues"]
+    assert "Oversized sitemap" in result["issues"]
+    assert result["score"] == 95
+
+
+def test_fetch_text_file_flags_oversized_body(site, monkeypatch):
+    monkeypatch.setattr(seo_tools, "MAX_TEXT_FILE_SIZE", 10)
+    
+    content, status, too_large = asyncio.run(
+        seo_tools.fetch_text_file("https://example.com/robots.txt")
+    )
+    
+    assert (content, status, too_large) == ("", 200, True)
+
+
+def test_page_analysis_results_are_copies(site):
+    async def analyze():
+        first = await seo_tools.analyze_page_seo.ainvoke({"url": "https://example.com"})
+        first["meta_tags"]["issues"].append("tampered")
+        first["priority_issues"].clear()
+        second = await seo_tools.analyze_page_seo.ainvoke({"url": "https://example.com"})
+        return first, second
+    
+    first, second = asyncio.run(analyze())
+    
+    assert "tampered" not in second["meta_tags"]["issues"]
+    assert second["priority_issues"]
+    
+    page = seo_tools._page_cache["https://example.com"][1]
+    assert page.is_parsed is False
+
+
+def test_site_audit_does_not_keep_soup_of_analyzed_page(site):
+    async def audit():
+        await seo_tools.analyze_page_seo.ainvoke({"url": "https://example.com"})
+        await seo_tools.analyze_site_seo.ainvoke({"url": "https://example.com"})
+    
+    asyncio.run(audit())
+    
+    page = seo_tools._page_cache["https://example.com"][1]
+    assert page.is_parsed is False
+
+
+def test_analyzers_skip_page_chrome():
+    soup = seo_tools.parse_html(CHROME_PAGE)
+    tags = seo_tools.index_tags(soup)
+    
+    headings = seo_tools.analyze_headings(soup, tags)
+    links = seo_tools.analyze_links(soup, "https://example.com", tags)
+    images = seo_tools.analyze_images(soup, tags)
+    
+    assert headings["h1_count"] == 1
+    assert not any("Multiple H1" in issue for issue in headings["issues"])
+    assert (links["internal_count"], links["external_count"]) == (1, 0)
+    assert images["total"] == 0
+
+
+def test_get_page_coalesces_concurrent_callers(fetches):
+    async def run():
+        fetches["release"] = asyncio.Event()
+        callers = [asyncio.create_task(seo_tools.get_page("https://example.com")) for _ in range(3)]
+        await asyncio.sleep(0)
+        fetches["release"].set()
+        return await asyncio.gather(*callers)
+    
+    pages = asyncio.run(run())
+    
+    assert fetches["calls"] == 1
+    assert pages[0] is pages[1] is pages[2]
+    assert seo_tools._inflight_pages == {}
+
+
+def test_get_page_cancelled_caller_keeps_shared_fetch(fetches):
+    async def run():
+        fetches["release"] = asyncio.Event()
+        first = asyncio.create_task(seo_tools.get_page("https://example.com"))
+        second = asyncio.create_task(seo_tools.get_page("https://example.com"))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        fetches["release"].set()
+        return first, await second
+    
+    first, page = asyncio.run(run())
+    
+    assert first.cancelled()
+    assert page.status_code == 200
+    assert fetches["calls"] == 1
+    assert "https://example.com" in seo_tools._page_cache
+
+
+def test_get_page_does_not_cache_failures(fetches):
+    fetches["error"] = httpx.ConnectError("boom")
+    
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(seo_tools.get_page("https://example.com"))
+    
+    assert seo_tools._page_cache == {}
+    assert seo_tools._inflight_pages == {}
+    
+    fetches["error"] = None
+    page = asyncio.run(seo_tools.get_page("https://example.com"))
+    
+    assert page.status_code == 200
+    assert fetches["calls"] == 2
+
+
+def test_get_page_refresh_bypasses_cache(fetches):
+    async def run():
+        first = await seo_tools.get_page("https://example.com")
+        cached = await seo_tools.get_page("https://example.com")
+        refreshed = await seo_tools.get_page("https://example.com", refresh=True)
+        return first, cached, refreshed
+    
+    first, cached, refreshed = asyncio.run(run())
+    
+    assert cached is first
+    assert fetches["calls"] == 2
+    # Unchanged HTML keeps the existing bundle (and its analysis)
+    assert refreshed is first
+
+
+class FakeKnowledgeService:
+    """In-memory brand settings for one user's organization."""
+    
+    def __init__(self):
+        self.settings = BrandSettings(id="b1", org_id="org1", website="https://old.example.com")
+        self.reads = 0
+    
+    async def get_user_org_id(self, user_id):
+        return "org1"
+    
+    async def get_brand_settings(self, org_id):
+        self.reads += 1
+        return self.settings
+    
+    async def save_brand_settings(self, org_id, *, website=None, **fields):
+        if website is not None:
+            self.settings.website = website
+        return self.settings
+
+
+def test_brand_update_invalidates_user_website_cache(monkeypatch):
+    service = FakeKnowledgeService()
+    monkeypatch.setattr(knowledge_service, "get_knowledge_service", lambda: service)
+    monkeypatch.setattr(knowledge, "get_knowledge_service", lambda: service)
+    monkeypatch.setattr(seo_tools, "_user_website_cache", {})
+    
+    async def run():
+        set_agent_context(agent_slug="seomi", user_id="u1")
+        try:
+            before = await seo_tools.get_user_website.ainvoke({})
+            cached = await seo_tools.get_user_website.ainvoke({})
+            await knowledge.update_brand_settings(
+                knowledge.BrandSettingsUpdate(website="https://new.example.com"),
+                user_id="u1",
+            )
+            after = await seo_tools.get_user_website.ainvoke({})
+        finally:
+            clear_agent_context()
+        return before, cached, after
+    
+    before, cached, after = asyncio.run(run())
+    
+    assert before["website"] == cached["website"] == "https://old.example.com"
+    assert after["website"] == "https://new.example.com"
+    assert service.reads == 2